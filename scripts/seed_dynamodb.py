@@ -6,7 +6,6 @@ Usage:
 """
 
 import argparse
-import json
 
 import boto3
 
@@ -83,12 +82,14 @@ def seed(table_name, region):
 
     records = [GLOBAL_CONFIG, SAMPLE_PROJECT, SAMPLE_PROJECT_MINIMAL]
 
-    for record in records:
-        # Convert None values to appropriate DynamoDB format
-        clean = json.loads(json.dumps(record, default=str), parse_float=str)
-        table.put_item(Item=clean)
-        print(f"Inserted: pk={clean['pk']}, sk={clean['sk']}")
+    # Records only hold str/int/bool/None/list/dict, which boto3 serializes natively
+    with table.batch_writer() as batch:
+        for record in records:
+            batch.put_item(Item=record)
 
+    # Buffered items are only sent when the batch writer flushes on exit
+    for record in records:
+        print(f"Inserted: pk={record['pk']}, sk={record['sk']}")
     print(f"\nSeeded {len(records)} records into {table_name}")
 
 
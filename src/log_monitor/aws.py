@@ -0,0 +1,37 @@
+"""Lazily created AWS clients shared across warm Lambda invocations."""
+
+import threading
+
+
+def lazy_client(factory):
+    """Wrap a client factory so it runs once, on first use.
+
+    Creation is locked because boto3's default session is not thread-safe, and
+    the searches, context fetches and publishes call the getter from worker
+    threads.
+
+    Args:
+        factory: Zero-argument callable that builds the client or resource.
+
+    Returns:
+        callable: Getter returning the shared instance. ``getter.reset()`` drops
+            it so the next call builds a fresh one (used by tests).
+    """
+    lock = threading.Lock()
+    instance = None
+
+    def get():
+        nonlocal instance
+        if instance is None:
+            with lock:
+                if instance is None:
+                    instance = factory()
+        return instance
+
+    def reset():
+        nonlocal instance
+        with lock:
+            instance = None
+
+    get.reset = reset
+    return get
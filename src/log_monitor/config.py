@@ -4,15 +4,30 @@ import logging
 
 import boto3
 
-from log_monitor.constants import TABLE_NAME
+from log_monitor.aws import lazy_client
+from log_monitor.constants import BOTO_CONFIG, TABLE_NAME
 
 logger = logging.getLogger(__name__)
 
+# PROJECT attributes read by the Lambda (projected on the PROJECT query)
+_PROJECT_ATTRIBUTES = (
+    "sk",
+    "display_name",
+    "enabled",
+    "stream_prefix",
+    "override_log_group",
+    "override_sns_topics",
+    "notification_template",
+    "mention",
+    "context_log_lines",
+    "exclude_patterns",
+    "monitors",
+    "last_searched_at",
+)
 
-def _get_table():
-    """Get DynamoDB table resource."""
-    dynamodb = boto3.resource("dynamodb")
-    return dynamodb.Table(TABLE_NAME)
+
+# DynamoDB table resource, reused across warm Lambda invocations
+_get_table = lazy_client(lambda: boto3.resource("dynamodb", config=BOTO_CONFIG).Table(TABLE_NAME))
 
 
 def get_global_config(table=None):
@@ -32,31 +47,60 @@ def get_global_config(table=None):
     return item
 
 
-def _query_all_by_pk(table, pk):
-    """Query all records with the given partition key, handling pagination.
+def _iter_by_pk(table, pk, attributes=None):
+    """Yield all records with the given partition key, handling pagination.
+
+    Records are yielded page by page, so callers can start processing before
+    the last page has been fetched.
 
     Args:
         table: DynamoDB table resource.
         pk: Partition key value.
+        attributes: Optional attribute names to project; all attributes when omitted.
 
-    Returns:
-        list[dict]: All matching records.
+    Yields:
+        dict: Matching records.
     """
-    items = []
     kwargs = {
         "KeyConditionExpression": boto3.dynamodb.conditions.Key("pk").eq(pk),
     }
+    if attributes:
+        # Alias every name so reserved words (e.g. "enabled") need no special casing
+        names = {f"#a{i}": name for i, name in enumerate(attributes)}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs["ExpressionAttributeNames"] = names
 
     while True:
         response = table.query(**kwargs)
-        items.extend(response.get("Items", []))
+        yield from response.get("Items", [])
 
         last_key = response.get("LastEvaluatedKey")
         if not last_key:
-            break
+            return
         kwargs["ExclusiveStartKey"] = last_key
 
-    return items
+
+def iter_all_projects(table=None):
+    """Yield all PROJECT records from DynamoDB.
+
+    Only the attributes in ``_PROJECT_ATTRIBUTES`` are read; anything else
+    stored on a PROJECT item (notes, "//" comment keys) is not transferred.
+
+    Yields:
+        dict: Project configuration records.
+    """
+    table = table or _get_table()
+    yield from _iter_by_pk(table, "PROJECT", _PROJECT_ATTRIBUTES)
+
+
+def iter_all_states(table=None):
+    """Yield all STATE records from DynamoDB.
+
+    Yields:
+        dict: State records.
+    """
+    table = table or _get_table()
+    yield from _iter_by_pk(table, "STATE")
 
 
 def query_all_projects(table=None):
@@ -65,8 +109,7 @@ def query_all_projects(table=None):
     Returns:
         list[dict]: All project configuration records.
     """
-    table = table or _get_table()
-    return _query_all_by_pk(table, "PROJECT")
+    return list(iter_all_projects(table))
 
 
 def query_all_states(table=None):
@@ -75,8 +118,7 @@ def query_all_states(table=None):
     Returns:
         list[dict]: All state records.
     """
-    table = table or _get_table()
-    return _query_all_by_pk(table, "STATE")
+    return list(iter_all_states(table))
 
 
 def update_project_timestamp(table, project_sk, timestamp_iso):
@@ -94,72 +136,81 @@ def update_project_timestamp(table, project_sk, timestamp_iso):
     )
 
 
-def update_state(table, project_sk, keyword, status, now_iso, detection_count=0, current_streak=0):
-    """Create or update a STATE record in DynamoDB.
+def build_state_item(state, project_sk, keyword, status, now_iso, detection_count=0, current_streak=0):
+    """Build the full STATE item for an ALARM or OK transition.
+
+    ALARM records the detection and notification time, adds the new detections
+    to detection_count and sets the streak; OK resets the streak and keeps the
+    history. The new detection_count is computed locally from the already-loaded
+    STATE record so the item can be written with a plain PutItem.
 
     Args:
-        table: DynamoDB table resource.
+        state: Current STATE record (dict or None).
         project_sk: Project sort key.
         keyword: Monitor keyword.
         status: New status ("ALARM" or "OK").
         now_iso: Current timestamp in ISO 8601.
-        detection_count: Total detection count.
+        detection_count: Number of new detections.
         current_streak: Current consecutive detection count.
+
+    Returns:
+        dict: Complete STATE item.
     """
-    sk = f"{project_sk}#{keyword}"
+    item = dict(state) if state else {}
+    item["pk"] = "STATE"
+    item["sk"] = f"{project_sk}#{keyword}"
+    item["status"] = status
 
     if status == "ALARM":
-        table.update_item(
-            Key={"pk": "STATE", "sk": sk},
-            UpdateExpression=(
-                "SET #status = :status, "
-                "last_detected_at = :now, "
-                "last_notified_at = :now, "
-                "detection_count = if_not_exists(detection_count, :zero) + :count, "
-                "current_streak = :streak"
-            ),
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={
-                ":status": status,
-                ":now": now_iso,
-                ":zero": 0,
-                ":count": detection_count,
-                ":streak": current_streak,
-            },
-        )
-    elif status == "OK":
-        table.update_item(
-            Key={"pk": "STATE", "sk": sk},
-            UpdateExpression="SET #status = :status, current_streak = :zero",
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={
-                ":status": status,
-                ":zero": 0,
-            },
-        )
-
-
-def update_state_suppress(table, project_sk, keyword, detection_count, current_streak):
-    """Update STATE record for SUPPRESS action (detected but not notifying).
-
-    Updates detection count and streak without changing last_notified_at.
+        item["last_detected_at"] = now_iso
+        item["last_notified_at"] = now_iso
+        item["detection_count"] = item.get("detection_count", 0) + detection_count
+        item["current_streak"] = current_streak
+    else:
+        item["current_streak"] = 0
+
+    return item
+
+
+def build_state_suppress_item(state, project_sk, keyword, detection_count, current_streak):
+    """Build the full STATE item for a SUPPRESS action (detected but not notifying).
+
+    Adds the new detections and updates the streak without changing
+    last_notified_at.
 
     Args:
-        table: DynamoDB table resource.
+        state: Current STATE record (dict or None).
         project_sk: Project sort key.
         keyword: Monitor keyword.
         detection_count: Number of new detections.
         current_streak: New streak count.
+
+    Returns:
+        dict: Complete STATE item.
     """
-    sk = f"{project_sk}#{keyword}"
-    table.update_item(
-        Key={"pk": "STATE", "sk": sk},
-        UpdateExpression=(
-            "SET detection_count = if_not_exists(detection_count, :zero) + :count, current_streak = :streak"
-        ),
-        ExpressionAttributeValues={
-            ":zero": 0,
-            ":count": detection_count,
-            ":streak": current_streak,
-        },
-    )
+    item = dict(state) if state else {}
+    item["pk"] = "STATE"
+    item["sk"] = f"{project_sk}#{keyword}"
+    item["detection_count"] = item.get("detection_count", 0) + detection_count
+    item["current_streak"] = current_streak
+    return item
+
+
+def batch_put_states(table, items):
+    """Write STATE items with BatchWriteItem.
+
+    boto3's batch writer chunks requests to 25 items and resends any
+    UnprocessedItems automatically.
+
+    Args:
+        table: DynamoDB table resource.
+        items: List of complete STATE items.
+    """
+    if not items:
+        return
+
+    with table.batch_writer(overwrite_by_pkeys=["pk", "sk"]) as batch:
+        for item in items:
+            batch.put_item(Item=item)
+
+    logger.info("Batch wrote %d STATE records", len(items))
@@ -2,8 +2,20 @@
 
 from datetime import timedelta, timezone
 
+from botocore.config import Config
+
 # JST timezone (+09:00)
 JST = timezone(timedelta(hours=9))
 
 # DynamoDB table name
 TABLE_NAME = "log-monitor"
+
+# Shared botocore configuration for all AWS clients.
+# Standard retry mode backs off on throttling; TCP keep-alive and a larger
+# connection pool let warm Lambda invocations reuse pooled HTTPS connections.
+BOTO_CONFIG = Config(
+    retries={"mode": "standard", "max_attempts": 5},
+    tcp_keepalive=True,
+    connect_timeout=1,
+    max_pool_connections=50,
+)
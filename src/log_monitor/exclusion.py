@@ -1,10 +1,97 @@
 """Exclusion pattern filtering with regex support."""
 
+import functools
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Numeric group references (\1, \g<1>, conditionals like (?(1)yes|no)) would point
+# at the wrong group once patterns are fused into a single alternation, so such
+# patterns stay separate.
+_NUMERIC_BACKREF = re.compile(r"\\(?:[1-9]|g<\d+>)|\(\?\(\d+\)")
+
+# Any of these characters means the pattern needs the regex engine
+_REGEX_METACHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def is_literal_pattern(pattern):
+    """Return True if the pattern contains no regex metacharacters.
+
+    A literal pattern matches exactly when it is a substring of the message,
+    so it can be tested with ``in`` instead of the regex engine.
+
+    Args:
+        pattern: Exclusion pattern string.
+
+    Returns:
+        bool: Whether the pattern is a plain literal.
+    """
+    return not _REGEX_METACHARS.search(pattern)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(pattern):
+    """Compile a single pattern, cached across warm Lambda invocations.
+
+    Args:
+        pattern: Regex pattern string.
+
+    Returns:
+        re.Pattern or None: Compiled regex, or None if the pattern is invalid.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        logger.warning("Invalid exclusion regex pattern '%s': %s", pattern, e)
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_exclusions(exclude_patterns):
+    """Split exclusion patterns into plain literals and as few regexes as possible.
+
+    Literal patterns are matched with a substring test. The remaining valid
+    patterns are fused into one alternation so each message is scanned once
+    instead of once per pattern. Invalid patterns are logged and skipped.
+
+    The result is cached per pattern tuple, so warm invocations with the same
+    configuration skip compilation entirely.
+
+    Args:
+        exclude_patterns: Tuple of regex pattern strings.
+
+    Returns:
+        tuple: (tuple[str] of literals, tuple[re.Pattern] of compiled regexes).
+    """
+    literals = []
+    fusable = []
+    separate = []
+    for pattern in exclude_patterns:
+        if is_literal_pattern(pattern):
+            literals.append(pattern)
+            continue
+
+        compiled = _compile(pattern)
+        if compiled is None:
+            continue
+
+        if _NUMERIC_BACKREF.search(pattern):
+            separate.append(compiled)
+        else:
+            fusable.append(pattern)
+
+    if len(fusable) == 1:
+        separate.append(_compile(fusable[0]))
+    elif fusable:
+        try:
+            separate.append(re.compile("|".join(f"(?:{p})" for p in fusable)))
+        except re.error:
+            # e.g. inline global flags or duplicate group names cannot be combined
+            separate.extend(_compile(p) for p in fusable)
+
+    return tuple(literals), tuple(separate)
+
 
 def apply_exclusions_regex(events, exclude_patterns):
     """Filter out log events that match any exclusion pattern.
@@ -22,22 +109,24 @@ def apply_exclusions_regex(events, exclude_patterns):
     if not exclude_patterns:
         return events
 
-    # Pre-compile patterns, skipping invalid ones
-    compiled = []
-    for pattern in exclude_patterns:
-        try:
-            compiled.append(re.compile(pattern))
-        except re.error as e:
-            logger.warning("Invalid exclusion regex pattern '%s': %s", pattern, e)
+    literals, compiled = _compile_exclusions(tuple(exclude_patterns))
 
-    if not compiled:
+    if not literals and not compiled:
         return events
 
-    filtered = []
-    for event in events:
-        message = event.get("message", "")
-        if not any(regex.search(message) for regex in compiled):
-            filtered.append(event)
+    # Plain loops over pre-bound methods avoid building an any() generator per event
+    searches = [regex.search for regex in compiled]
+
+    def excluded(message):
+        for literal in literals:
+            if literal in message:
+                return True
+        for search in searches:
+            if search(message):
+                return True
+        return False
+
+    filtered = [event for event in events if not excluded(event.get("message", ""))]
 
     excluded_count = len(events) - len(filtered)
     if excluded_count > 0:
@@ -1,28 +1,29 @@
 """Lambda handler for CloudWatch Logs monitoring."""
 
-import copy
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-import boto3
-
 from log_monitor.config import (
+    _get_table,
+    batch_put_states,
+    build_state_item,
+    build_state_suppress_item,
     get_global_config,
+    iter_all_states,
     query_all_projects,
-    query_all_states,
     update_project_timestamp,
-    update_state,
-    update_state_suppress,
 )
-from log_monitor.constants import TABLE_NAME
-from log_monitor.exclusion import apply_exclusions_regex
+from log_monitor.exclusion import apply_exclusions_regex, is_literal_pattern
 from log_monitor.log_searcher import (
     filter_log_events_with_pagination,
     get_previous_log_lines,
+    iso_to_epoch_ms,
 )
-from log_monitor.metrics import put_metric_data
+from log_monitor.metrics import put_metric_data_batch
 from log_monitor.notifier import render_message, resolve_sns_topic, resolve_template, sns_publish
-from log_monitor.state import evaluate_state, find_state
+from log_monitor.state import evaluate_state, find_state, index_states
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -33,22 +34,52 @@ INGESTION_DELAY_BUFFER_MIN = 2
 # Default search window for new projects (minutes)
 DEFAULT_SEARCH_WINDOW_MIN = 5
 
+# Maximum concurrent FilterLogEvents searches (kept below BOTO_CONFIG max_pool_connections)
+MAX_SEARCH_WORKERS = 16
+
+# How long a warm container may reuse GLOBAL#CONFIG before re-reading it (seconds)
+GLOBAL_CONFIG_CACHE_TTL_SEC = 300
+
+# Warm-container cache for GLOBAL#CONFIG
+_global_config_cache = {"config": None, "expires_at": 0.0}
+
 
 def _now_utc():
     """Get current UTC time."""
     return datetime.now(timezone.utc)
 
 
+def _to_iso(dt):
+    """Format a UTC datetime as an ISO 8601 string with a Z suffix (e.g. "2026-02-20T05:10:00Z")."""
+    return dt.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _get_cached_global_config(table):
+    """Get GLOBAL#CONFIG, reusing the copy cached by a recent warm invocation.
+
+    PROJECT and STATE records are not cached: last_searched_at and alarm
+    state change on every run.
+    """
+    now = time.monotonic()
+    if _global_config_cache["config"] is not None and now < _global_config_cache["expires_at"]:
+        return _global_config_cache["config"]
+
+    global_config = get_global_config(table)
+    _global_config_cache["config"] = global_config
+    _global_config_cache["expires_at"] = now + GLOBAL_CONFIG_CACHE_TTL_SEC
+    return global_config
+
+
 def handler(event, context):
     """Lambda entry point for CloudWatch Logs monitoring.
 
     Triggered by EventBridge every 5 minutes. For each enabled project:
     1. Searches CloudWatch Logs for configured keywords
     2. Applies exclusion patterns
-    3. Sends CloudWatch metrics
+    3. Sends CloudWatch metrics (batched after all projects are processed)
     4. Evaluates state transitions
     5. Sends SNS notifications as needed
-    6. Updates DynamoDB state
+    6. Updates DynamoDB state (batched after all projects are processed)
 
     Args:
         event: EventBridge scheduled event (unused).
@@ -57,18 +88,22 @@ def handler(event, context):
     Returns:
         dict: Summary of processing results.
     """
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(TABLE_NAME)
+    table = _get_table()
 
-    # 1. Load all configuration
-    global_config = get_global_config(table)
-    projects = query_all_projects(table)
-    states = query_all_states(table)
+    # 1. Load GLOBAL and PROJECT configuration (independent reads, so overlap them)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        global_future = executor.submit(_get_cached_global_config, table)
+        projects_future = executor.submit(query_all_projects, table)
+    global_config = global_future.result()
+    projects = projects_future.result()
 
     # Search end time = now - ingestion delay buffer
     now = _now_utc()
     search_end = now - timedelta(minutes=INGESTION_DELAY_BUFFER_MIN)
-    search_end_iso = search_end.strftime("%Y-%m-%dT%H:%M:%SZ")
+    search_end_iso = _to_iso(search_end)
+
+    # Search start for projects that have never been searched
+    default_start_iso = _to_iso(search_end - timedelta(minutes=DEFAULT_SEARCH_WINDOW_MIN))
 
     results = {
         "processed_projects": 0,
@@ -77,33 +112,147 @@ def handler(event, context):
         "notifications_sent": 0,
     }
 
-    for project in projects:
-        # Skip disabled projects
-        if not project.get("enabled", True):
-            logger.info("Skipping disabled project: %s", project.get("sk"))
-            continue
+    if not any(project.get("enabled", True) for project in projects):
+        logger.info("No enabled projects, nothing to do")
+        return results
+
+    # STATE items per project and (project, keyword, count) metrics to write, and
+    # projects whose search window can be advanced
+    pending_writes = {}
+    pending_metrics = []
+    searched_projects = set()
+
+    with ThreadPoolExecutor(max_workers=MAX_SEARCH_WORKERS) as executor:
+        # STATE records are only needed once search results come back, so load
+        # them alongside the searches; pages are indexed as they stream in
+        states_future = executor.submit(lambda: index_states(iter_all_states(table)))
+
+        # 2. Start all log searches up front so their network waits overlap
+        submitted = []
+        search_cache = {}
+        for project in projects:
+            # Skip disabled projects
+            if not project.get("enabled", True):
+                logger.info("Skipping disabled project: %s", project.get("sk"))
+                continue
+
+            project_sk = project["sk"]
+
+            try:
+                log_group, searches = _submit_searches(
+                    executor, search_cache, project, project_sk, global_config, default_start_iso, search_end_iso
+                )
+            except Exception:
+                logger.exception("Failed to process project %s, skipping", project_sk)
+                continue
 
-        project_sk = project["sk"]
+            submitted.append((project, project_sk, log_group, searches))
 
+        states = states_future.result()
+
+        # State evaluation and STATE queuing stay on this thread, in project order
+        for project, project_sk, log_group, searches in submitted:
+            project_writes = pending_writes.setdefault(project_sk, [])
+            try:
+                _process_project(
+                    executor,
+                    project,
+                    project_sk,
+                    log_group,
+                    searches,
+                    global_config,
+                    states,
+                    now,
+                    search_end_iso,
+                    results,
+                    project_writes,
+                    pending_metrics,
+                )
+            except Exception:
+                logger.exception("Failed to process project %s, skipping", project_sk)
+                continue
+
+            searched_projects.add(project_sk)
+
+    # Metrics are best-effort and must not block the STATE flush
+    if pending_metrics:
         try:
-            _process_project(project, project_sk, global_config, states, table, search_end, search_end_iso, results)
+            put_metric_data_batch(global_config.get("metric_namespace", "LogMonitor"), pending_metrics)
         except Exception:
-            logger.exception("Failed to process project %s, skipping", project_sk)
-            continue
+            logger.exception("Metrics failed for %d monitors, continuing", len(pending_metrics))
+
+    # 7. Flush STATE per project, advancing a project's timestamp only once its STATE
+    # is persisted; the projects are flushed concurrently
+    flushes = [(sk, items) for sk, items in pending_writes.items() if items or sk in searched_projects]
+    if flushes:
+        with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(flushes))) as executor:
+            for sk, items in flushes:
+                executor.submit(_flush_project, table, sk, items, sk in searched_projects, search_end_iso)
 
     logger.info("Processing complete: %s", results)
     return results
 
 
-def _process_project(project, project_sk, global_config, states, table, search_end, search_end_iso, results):
-    """Process a single project's monitors."""
+def _flush_project(table, project_sk, items, advance, search_end_iso):
+    """Persist one project's STATE items, then advance its search window.
+
+    A failure is logged rather than raised: notifications may already have gone
+    out, so the other projects must still be persisted. The failed project keeps
+    its last_searched_at and its window is searched again on the next run.
+
+    Args:
+        table: DynamoDB table resource.
+        project_sk: Project sort key.
+        items: Complete STATE items for the project.
+        advance: Whether the project's search completed and last_searched_at may move.
+        search_end_iso: New last_searched_at value.
+    """
+    try:
+        batch_put_states(table, items)
+        # PROJECT items are human-edited and read with a projection, so they are
+        # updated in place rather than batch-put
+        if advance:
+            update_project_timestamp(table, project_sk, search_end_iso)
+    except Exception:
+        logger.exception("Failed to persist STATE for project %s, window will be re-searched", project_sk)
+
+
+def _flatten_monitors(monitors_config):
+    """Expand monitors whose 'keyword' is a list into one monitor per keyword.
+
+    Monitors without a keyword are dropped.
+
+    Args:
+        monitors_config: List of monitor configuration dicts.
+
+    Returns:
+        list[dict]: Monitors with a single string keyword each.
+    """
+    monitors = []
+    for m in monitors_config:
+        keywords = m.get("keyword")
+        if isinstance(keywords, list):
+            # Shallow copies are enough: monitor dicts are only read downstream
+            monitors.extend({**m, "keyword": kw} for kw in keywords)
+        elif keywords:
+            monitors.append(m)
+    return monitors
+
+
+def _submit_searches(executor, search_cache, project, project_sk, global_config, default_start_iso, search_end_iso):
+    """Submit one FilterLogEvents search per monitor of a project.
+
+    Identical searches (same log group, stream prefix, keyword, time range and
+    server-side exclusions) are submitted once per invocation and shared via
+    ``search_cache``, e.g. when projects share a log group and stream prefix.
+
+    Returns:
+        tuple: (log_group, list of (monitor, Future) pairs in monitor order).
+    """
     log_group = project.get("override_log_group") or global_config["source_log_group"]
 
     # Search start: last_searched_at or default window
-    search_start = project.get("last_searched_at")
-    if not search_start:
-        default_start = search_end - timedelta(minutes=DEFAULT_SEARCH_WINDOW_MIN)
-        search_start = default_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    search_start = project.get("last_searched_at") or default_start_iso
 
     logger.info(
         "Processing project %s: log_group=%s, range=[%s, %s]",
@@ -113,32 +262,104 @@ def _process_project(project, project_sk, global_config, states, table, search_e
         search_end_iso,
     )
 
-    monitors_config = project.get("monitors", [])
+    # Bounds are parsed once per project; every monitor's search takes epoch ms
+    start_ms = iso_to_epoch_ms(search_start)
+    end_ms = iso_to_epoch_ms(search_end_iso)
 
-    # Flatten 'keyword' if it is a list of strings
-    monitors = []
-    for m in monitors_config:
-        keywords = m.get("keyword")
-        if isinstance(keywords, list):
-            for kw in keywords:
-                new_m = copy.deepcopy(m)
-                new_m["keyword"] = kw
-                monitors.append(new_m)
-        elif keywords:
-            monitors.append(m)
+    monitors = _flatten_monitors(project.get("monitors", []))
 
+    searches = []
     for monitor in monitors:
+        # Literal exclusions can be dropped server-side; all are re-applied client-side
+        excludes = project.get("exclude_patterns", []) + monitor.get("exclude_patterns", [])
+        negative_terms = [p for p in excludes if is_literal_pattern(p)]
+
+        search_key = (
+            log_group,
+            project.get("stream_prefix"),
+            monitor["keyword"],
+            start_ms,
+            end_ms,
+            tuple(negative_terms),
+        )
+        future = search_cache.get(search_key)
+        if future is None:
+            future = executor.submit(
+                filter_log_events_with_pagination,
+                log_group=log_group,
+                stream_prefix=project.get("stream_prefix"),
+                keyword=monitor["keyword"],
+                start_time=start_ms,
+                end_time=end_ms,
+                negative_terms=negative_terms,
+            )
+            search_cache[search_key] = future
+        searches.append((monitor, future))
+
+    return log_group, searches
+
+
+def _submit_context_fetch(executor, project, monitor, log_group, matches, action):
+    """Start fetching the log lines preceding the first match, if configured.
+
+    Returns:
+        Future or None: Future resolving to the previous log lines, or None
+            when no context is needed for this action/monitor.
+    """
+    if not matches or action not in ("NOTIFY", "RENOTIFY"):
+        return None
+
+    context_lines_count = monitor.get("context_log_lines") or project.get("context_log_lines") or 0
+    if context_lines_count <= 0:
+        return None
+
+    first_match = matches[0]
+    timestamp = first_match.get("timestamp")
+    stream_name = first_match.get("logStreamName")
+    if not timestamp or not stream_name:
+        return None
+
+    return executor.submit(
+        get_previous_log_lines,
+        log_group=log_group,
+        stream_name=stream_name,
+        timestamp=timestamp,
+        limit=int(context_lines_count),
+        match_message=first_match.get("message"),
+    )
+
+
+def _process_project(
+    executor,
+    project,
+    project_sk,
+    log_group,
+    searches,
+    global_config,
+    states,
+    now,
+    search_end_iso,
+    results,
+    pending_writes,
+    pending_metrics,
+):
+    """Process a single project's monitors once their searches are submitted.
+
+    All monitors are evaluated first so that context-line fetches for every
+    notifying monitor run concurrently on ``executor``; notifications are then
+    published concurrently on the same pool.
+
+    STATE mutations and metric values are appended to ``pending_writes`` and
+    ``pending_metrics`` rather than sent immediately, so the caller can flush
+    them in batched calls.
+    """
+    evaluated = []
+    for monitor, search in searches:
         keyword = monitor["keyword"]
         results["total_monitors"] += 1
 
-        # 2. Search logs
-        raw_matches = filter_log_events_with_pagination(
-            log_group=log_group,
-            stream_prefix=project.get("stream_prefix"),
-            keyword=keyword,
-            start_time=search_start,
-            end_time=search_end_iso,
-        )
+        # 2. Wait for the log search
+        raw_matches = search.result()
 
         # 3. Apply exclusion filters (PROJECT + MONITOR level)
         excludes = project.get("exclude_patterns", []) + monitor.get("exclude_patterns", [])
@@ -146,21 +367,13 @@ def _process_project(project, project_sk, global_config, states, table, search_e
 
         results["total_detections"] += len(matches)
 
-        # 4. Send metrics (always, even if 0, unless explicitly disabled)
+        # 4. Queue metrics (always, even if 0, unless explicitly disabled)
         if not global_config.get("disable_custom_metrics", False):
-            try:
-                put_metric_data(
-                    namespace=global_config.get("metric_namespace", "LogMonitor"),
-                    project=project_sk,
-                    keyword=keyword,
-                    value=len(matches),
-                )
-            except Exception:
-                logger.exception("Metrics failed for %s/%s, continuing", project_sk, keyword)
+            pending_metrics.append((project_sk, keyword, len(matches)))
 
         # 5. Evaluate state transition
         state = find_state(states, project_sk, keyword)
-        action = evaluate_state(state, matches, monitor, global_config)
+        action = evaluate_state(state, matches, monitor, global_config, now)
 
         logger.info(
             "Project %s, keyword %s: matches=%d, action=%s",
@@ -170,24 +383,18 @@ def _process_project(project, project_sk, global_config, states, table, search_e
             action,
         )
 
-        # 6. Send notification if needed
+        context = _submit_context_fetch(executor, project, monitor, log_group, matches, action)
+        evaluated.append((monitor, keyword, matches, state, action, context))
+
+    # 6. Send notifications concurrently; a monitor's STATE is only queued once its
+    # publish has succeeded so a failed notification is retried on the next run
+    publishes = []
+    silent_writes = []
+    for monitor, keyword, matches, state, action, context in evaluated:
+        item = _build_state_update(state, project_sk, keyword, matches, action, search_end_iso)
+
         if action in ("NOTIFY", "RENOTIFY", "RECOVER"):
-            # Fetch context log lines
-            previous_log_lines = []
-            if matches and action in ("NOTIFY", "RENOTIFY"):
-                context_lines_count = monitor.get("context_log_lines") or project.get("context_log_lines") or 0
-                if context_lines_count > 0:
-                    first_match = matches[0]
-                    timestamp = first_match.get("timestamp")
-                    stream_name = first_match.get("logStreamName")
-                    if timestamp and stream_name:
-                        previous_log_lines = get_previous_log_lines(
-                            log_group=log_group,
-                            stream_name=stream_name,
-                            timestamp=timestamp,
-                            limit=int(context_lines_count),
-                            match_message=first_match.get("message"),
-                        )
+            previous_log_lines = context.result() if context else []
 
             topic_arn = resolve_sns_topic(monitor, project, global_config)
             template = resolve_template(monitor, project, global_config)
@@ -201,22 +408,50 @@ def _process_project(project, project_sk, global_config, states, table, search_e
                 state=state,
                 previous_log_lines=previous_log_lines,
             )
-            sns_publish(topic_arn, message)
-            results["notifications_sent"] += 1
-
-        # 7. Update STATE in DynamoDB
-        streak = (state.get("current_streak", 0) if state else 0) + 1 if len(matches) > 0 else 0
-
-        if action == "NOTIFY":
-            update_state(table, project_sk, keyword, "ALARM", search_end_iso, len(matches), streak)
-        elif action == "RENOTIFY":
-            update_state(table, project_sk, keyword, "ALARM", search_end_iso, len(matches), streak)
-        elif action == "SUPPRESS":
-            update_state_suppress(table, project_sk, keyword, len(matches), streak)
-        elif action in ("RECOVER", "RECOVER_SILENT"):
-            update_state(table, project_sk, keyword, "OK", search_end_iso)
-        # NOOP: no state update needed
-
-    # 8. Update project timestamp after all monitors processed
-    update_project_timestamp(table, project_sk, search_end_iso)
+            publishes.append((executor.submit(sns_publish, topic_arn, message), item))
+        elif item is not None:
+            silent_writes.append(item)
+
+    error = None
+    for future, item in publishes:
+        exc = future.exception()
+        if exc is not None:
+            error = error or exc
+            continue
+        results["notifications_sent"] += 1
+        pending_writes.append(item)
+    if error is not None:
+        # last_searched_at stays put and the window is searched again, so SUPPRESS /
+        # RECOVER_SILENT updates are dropped rather than applied a second time
+        raise error
+
+    # 7. Queue STATE updates for DynamoDB
+    pending_writes.extend(silent_writes)
+
     results["processed_projects"] += 1
+
+
+def _build_state_update(state, project_sk, keyword, matches, action, now_iso):
+    """Build the STATE item to write for ``action``, or None when nothing changes.
+
+    Args:
+        state: Existing STATE record, or None.
+        project_sk: Project sort key.
+        keyword: Monitor keyword.
+        matches: Events left after exclusions.
+        action: Result of evaluate_state.
+        now_iso: Timestamp recorded as detection / notification time.
+
+    Returns:
+        dict | None: Full STATE item, or None for NOOP.
+    """
+    streak = (state.get("current_streak", 0) if state else 0) + 1 if len(matches) > 0 else 0
+
+    if action in ("NOTIFY", "RENOTIFY"):
+        return build_state_item(state, project_sk, keyword, "ALARM", now_iso, len(matches), streak)
+    if action == "SUPPRESS":
+        return build_state_suppress_item(state, project_sk, keyword, len(matches), streak)
+    if action in ("RECOVER", "RECOVER_SILENT"):
+        return build_state_item(state, project_sk, keyword, "OK", now_iso)
+    # NOOP: no state update needed
+    return None
@@ -1,47 +1,146 @@
 """CloudWatch Logs search with FilterLogEvents API."""
 
+import functools
+import itertools
 import logging
+import numbers
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 
 import boto3
-from botocore.config import Config
+
+from log_monitor.aws import lazy_client
+from log_monitor.constants import BOTO_CONFIG
 
 logger = logging.getLogger(__name__)
 
-# Enable standard retry mode with exponential backoff for throttling
-_BOTO_CONFIG = Config(
-    retries={"mode": "standard", "max_attempts": 5},
-)
+# FilterLogEvents rejects filter patterns longer than this
+_MAX_FILTER_PATTERN_LENGTH = 1024
+
+# Largest page FilterLogEvents / GetLogEvents will return (also capped at 1 MB)
+_MAX_EVENTS_PER_PAGE = 10000
+
+# Extra events read on the fast path of get_previous_log_lines, so the detected
+# event is still found when a few lines share its timestamp
+_CONTEXT_FETCH_BUFFER = 10
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
 
-def _get_logs_client():
-    """Get CloudWatch Logs client with retry configuration."""
-    return boto3.client("logs", config=_BOTO_CONFIG)
+# CloudWatch Logs client, reused across warm Lambda invocations
+_get_logs_client = lazy_client(lambda: boto3.client("logs", config=BOTO_CONFIG))
 
 
+@functools.lru_cache(maxsize=256)
 def iso_to_epoch_ms(iso_string):
     """Convert ISO 8601 timestamp string to epoch milliseconds.
 
+    Cached because every monitor of a project converts the same start/end
+    strings.
+
     Args:
         iso_string: ISO 8601 timestamp string (e.g. "2026-02-20T05:10:00Z").
 
     Returns:
         int: Epoch time in milliseconds.
     """
-    from datetime import datetime
+    dt = datetime.fromisoformat(iso_string)
+    if dt.tzinfo is None:
+        # Same local-time interpretation as datetime.timestamp()
+        dt = dt.astimezone()
+    # Exact integer timedelta arithmetic instead of float seconds * 1000
+    return (dt - _EPOCH) // _ONE_MS
+
+
+def _to_epoch_ms(value):
+    """Return ``value`` as epoch milliseconds, parsing it only if it is a string.
+
+    Args:
+        value: ISO 8601 timestamp string, or epoch milliseconds as an integer or an
+            integral Decimal (as DynamoDB returns numbers).
+
+    Returns:
+        int: Epoch time in milliseconds.
+
+    Raises:
+        TypeError: If ``value`` is a bool.
+        ValueError: If ``value`` is a Decimal with a fractional part.
+    """
+    if isinstance(value, bool):
+        raise TypeError("epoch milliseconds must be an integer, not bool")
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, Decimal):
+        if value != value.to_integral_value():
+            raise ValueError(f"epoch milliseconds must be integral: {value}")
+        return int(value)
+    return iso_to_epoch_ms(value)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_filter(keyword):
+    """Build the base filter pattern for a keyword.
+
+    Keywords starting with ``{`` are CloudWatch JSON filter expressions (e.g.
+    ``{ $.level = "ERROR" }``) and are passed through with surrounding
+    whitespace stripped, so the result starts with ``{``. Anything else
+    is matched as a quoted exact phrase, with embedded quotes and backslashes
+    escaped.
+
+    Args:
+        keyword: Keyword or JSON filter expression.
+
+    Returns:
+        str: Filter pattern string.
+    """
+    expression = keyword.strip()
+    if expression.startswith("{"):
+        return expression
+    escaped = keyword.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def build_filter_pattern(keyword, negative_terms=None):
+    """Build a FilterLogEvents filter pattern for a keyword.
 
-    dt = datetime.fromisoformat(iso_string.replace("Z", "+00:00"))
-    return int(dt.timestamp() * 1000)
+    Negative terms are appended as ``-"term"`` so CloudWatch drops those
+    events server-side. Terms containing quotes or backslashes, and terms that
+    would push the pattern past the API length limit, are left out; callers
+    still apply their exclusions client-side. JSON filter expressions do not
+    take negative terms.
 
+    Args:
+        keyword: Keyword to search for, or a JSON filter expression.
+        negative_terms: Optional literal substrings to exclude.
+
+    Returns:
+        str: Filter pattern string.
+    """
+    pattern = _compile_filter(keyword)
+    if pattern.startswith("{"):
+        return pattern
+    for term in negative_terms or ():
+        if not term or '"' in term or "\\" in term:
+            continue
+        candidate = f'{pattern} -"{term}"'
+        if len(candidate) > _MAX_FILTER_PATTERN_LENGTH:
+            break
+        pattern = candidate
+    return pattern
 
-def filter_log_events_with_pagination(log_group, stream_prefix, keyword, start_time, end_time, client=None):
+
+def filter_log_events_with_pagination(
+    log_group, stream_prefix, keyword, start_time, end_time, negative_terms=None, client=None
+):
     """Search CloudWatch Logs using FilterLogEvents with pagination.
 
     Args:
         log_group: CloudWatch Logs log group name.
         stream_prefix: Log stream name prefix to filter.
         keyword: Keyword to search for in log messages.
-        start_time: Search start time (ISO 8601 string).
-        end_time: Search end time (ISO 8601 string).
+        start_time: Search start time (ISO 8601 string, or epoch milliseconds).
+        end_time: Search end time (ISO 8601 string, or epoch milliseconds).
+        negative_terms: Optional literal substrings excluded server-side.
         client: Optional boto3 logs client (for testing).
 
     Returns:
@@ -52,15 +151,16 @@ def filter_log_events_with_pagination(log_group, stream_prefix, keyword, start_t
     """
     client = client or _get_logs_client()
 
-    start_ms = iso_to_epoch_ms(start_time)
-    end_ms = iso_to_epoch_ms(end_time)
+    start_ms = _to_epoch_ms(start_time)
+    end_ms = _to_epoch_ms(end_time)
 
     kwargs = {
         "logGroupName": log_group,
         "startTime": start_ms,
         "endTime": end_ms,
-        "filterPattern": f'"{keyword}"',
+        "filterPattern": build_filter_pattern(keyword, negative_terms),
         "interleaved": True,
+        "limit": _MAX_EVENTS_PER_PAGE,
     }
 
     # Only add stream prefix filter if provided
@@ -90,9 +190,36 @@ def filter_log_events_with_pagination(log_group, stream_prefix, keyword, start_t
     return all_events
 
 
-def get_previous_log_lines(log_group, stream_name, timestamp, limit, match_message=None, client=None):
+def _find_target_index(events, timestamp, match_message=None):
+    """Return the index of the detected event, scanning from the newest event.
+
+    Args:
+        events: Log events in ascending time order.
+        timestamp: Timestamp of the detected event in milliseconds.
+        match_message: Optional exact message string to match for precise cut-off.
+
+    Returns:
+        int: Index of the detected event, or -1 if it is not present.
+    """
+    # If match_message is provided, require exact match. Otherwise, just match timestamp.
+    target_message = match_message.rstrip() if match_message else None
+    for i in range(len(events) - 1, -1, -1):
+        e = events[i]
+        if e.get("timestamp") == timestamp:
+            if target_message is None or e.get("message", "").rstrip() == target_message:
+                return i
+    return -1
+
+
+def get_previous_log_lines(log_group, stream_name, timestamp, limit, match_message=None, client=None, window_ms=60000):
     """Fetch preceding log lines from the same stream before the given event timestamp.
 
+    The window ``[timestamp - window_ms, timestamp]`` is read backward from the
+    detected event: first only the newest ``limit`` + a small buffer events,
+    then older pages via ``nextBackwardToken`` only while the detected event or
+    enough lines before it have not been seen (e.g. a large burst at the same
+    millisecond).
+
     Args:
         log_group: CloudWatch Logs log group name.
         stream_name: Log stream name.
@@ -100,6 +227,7 @@ def get_previous_log_lines(log_group, stream_name, timestamp, limit, match_messa
         limit: Number of preceding lines to fetch.
         match_message: Optional exact message string to match for precise cut-off.
         client: Optional boto3 logs client.
+        window_ms: How far before the detected event to look, in milliseconds.
 
     Returns:
         list[str]: Previous log messages.
@@ -109,49 +237,49 @@ def get_previous_log_lines(log_group, stream_name, timestamp, limit, match_messa
 
     client = client or _get_logs_client()
     try:
-        # Fetch forward from 1 minute before the target event to ensure we capture bursts
-        start_time = max(0, timestamp - 60000)
-        end_time = timestamp + 1
-
-        all_events = []
         kwargs = {
             "logGroupName": log_group,
             "logStreamName": stream_name,
-            "startTime": start_time,
-            "endTime": end_time,
-            "startFromHead": True,
+            "startTime": max(0, timestamp - window_ms),
+            "endTime": timestamp + 1,
+            "startFromHead": False,
+            "limit": min(limit + _CONTEXT_FETCH_BUFFER, _MAX_EVENTS_PER_PAGE),
         }
 
-        # Paginate through results
-        prev_token = None
+        # Pages arrive newest first; only each new page is searched, and the
+        # window is stitched together once at the end
+        pages = []
+        found = False
+        preceding = 0
         while True:
             response = client.get_log_events(**kwargs)
-            events = response.get("events", [])
-            all_events.extend(events)
+            page = response.get("events", [])
+            pages.append(page)
+
+            if found:
+                preceding += len(page)
+            else:
+                page_index = _find_target_index(page, timestamp, match_message)
+                found = page_index != -1
+                preceding = max(page_index, 0)
+            if found and preceding >= limit:
+                break
 
-            # get_log_events returns the same nextForwardToken when no more data
-            next_token = response.get("nextForwardToken")
-            if not next_token or next_token == prev_token:
+            # A short page is not the end of the window: GetLogEvents also stops at 1 MB.
+            # It returns the token it was given once the window is exhausted.
+            next_token = response.get("nextBackwardToken")
+            if not next_token or next_token == kwargs.get("nextToken"):
                 break
-            prev_token = next_token
             kwargs["nextToken"] = next_token
+            kwargs["limit"] = _MAX_EVENTS_PER_PAGE
 
-        # Find the exact match backwards
-        target_index = -1
-        for i in range(len(all_events) - 1, -1, -1):
-            e = all_events[i]
-            if e.get("timestamp") == timestamp:
-                # If match_message is provided, require exact match. Otherwise, just match timestamp.
-                if not match_message or e.get("message", "").rstrip() == match_message.rstrip():
-                    target_index = i
-                    break
-
+        events = list(itertools.chain.from_iterable(reversed(pages)))
+        target_index = _find_target_index(events, timestamp, match_message)
         if target_index == -1:
             # Fallback if exact line is not found: filter strictly before timestamp
-            previous_events = [e for e in all_events if e.get("timestamp", 0) < timestamp]
-            return [e["message"].rstrip() for e in previous_events[-limit:]]
-
-        previous_events = all_events[:target_index]
+            previous_events = [e for e in events if e.get("timestamp", 0) < timestamp]
+        else:
+            previous_events = events[:target_index]
         return [e["message"].rstrip() for e in previous_events[-limit:]]
     except Exception as e:
         logger.warning("Failed to get previous log lines for %s/%s: %s", log_group, stream_name, e)
@@ -4,8 +4,30 @@ import logging
 
 import boto3
 
+from log_monitor.aws import lazy_client
+from log_monitor.constants import BOTO_CONFIG
+
 logger = logging.getLogger(__name__)
 
+# PutMetricData accepts at most this many MetricDatum per request
+_MAX_METRICS_PER_REQUEST = 1000
+
+# CloudWatch client, reused across warm Lambda invocations
+_get_cloudwatch_client = lazy_client(lambda: boto3.client("cloudwatch", config=BOTO_CONFIG))
+
+
+def _build_metric_datum(project, keyword, value):
+    """Build a KeywordDetectionCount MetricDatum."""
+    return {
+        "MetricName": "KeywordDetectionCount",
+        "Dimensions": [
+            {"Name": "Project", "Value": project},
+            {"Name": "Keyword", "Value": keyword},
+        ],
+        "Value": value,
+        "Unit": "Count",
+    }
+
 
 def put_metric_data(namespace, project, keyword, value, client=None):
     """Send KeywordDetectionCount metric to CloudWatch.
@@ -17,24 +39,47 @@ def put_metric_data(namespace, project, keyword, value, client=None):
         value: Detection count (after exclusions).
         client: Optional boto3 CloudWatch client (for testing).
     """
-    client = client or boto3.client("cloudwatch")
+    client = client or _get_cloudwatch_client()
 
     try:
         client.put_metric_data(
             Namespace=namespace,
-            MetricData=[
-                {
-                    "MetricName": "KeywordDetectionCount",
-                    "Dimensions": [
-                        {"Name": "Project", "Value": project},
-                        {"Name": "Keyword", "Value": keyword},
-                    ],
-                    "Value": value,
-                    "Unit": "Count",
-                }
-            ],
+            MetricData=[_build_metric_datum(project, keyword, value)],
         )
         logger.debug("PutMetricData: %s/%s=%d", project, keyword, value)
     except Exception:
         logger.exception("Failed to put metric data for %s/%s", project, keyword)
         raise
+
+
+def put_metric_data_batch(namespace, detections, client=None):
+    """Send KeywordDetectionCount metrics for many monitors in as few calls as possible.
+
+    Args:
+        namespace: CloudWatch metric namespace (e.g. "LogMonitor").
+        detections: List of (project, keyword, value) tuples.
+        client: Optional boto3 CloudWatch client (for testing).
+
+    Raises:
+        Exception: The first PutMetricData error, after all chunks were attempted.
+    """
+    if not detections:
+        return
+
+    client = client or _get_cloudwatch_client()
+    metric_data = [_build_metric_datum(project, keyword, value) for project, keyword, value in detections]
+
+    # A failed chunk must not cost the others their metrics; the first error is
+    # raised once every chunk has been attempted
+    error = None
+    for i in range(0, len(metric_data), _MAX_METRICS_PER_REQUEST):
+        chunk = metric_data[i : i + _MAX_METRICS_PER_REQUEST]
+        try:
+            client.put_metric_data(Namespace=namespace, MetricData=chunk)
+        except Exception as e:
+            logger.exception("Failed to put metric data batch (%d metrics)", len(chunk))
+            error = error or e
+
+    if error is not None:
+        raise error
+    logger.debug("PutMetricData: %d metrics", len(metric_data))
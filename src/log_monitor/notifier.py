@@ -1,17 +1,50 @@
 """SNS notification with 3-level fallback resolution and template rendering."""
 
+import functools
+import itertools
 import json
 import logging
+import re
 from datetime import datetime
 
 import boto3
 
-from log_monitor.constants import JST
+from log_monitor.aws import lazy_client
+from log_monitor.constants import BOTO_CONFIG, JST
 
 logger = logging.getLogger(__name__)
 
 # SNS message size limit (256 KB)
 _SNS_MAX_MESSAGE_BYTES = 256 * 1024
+_TRUNCATION_MARKER = "\n... (truncated)"
+
+# Display format for {detected_at}
+_JST_FORMAT = "%Y-%m-%d %H:%M:%S JST"
+
+# Fixed layout of NOTIFY / RENOTIFY bodies, rendered in one str.format call
+_BODY_TEMPLATE = (
+    "{subject}\n"
+    "{mention_line}"
+    "検出件数: {count}\n"
+    "タイムスタンプ: {detected_at}\n"
+    "ロググループ: {log_group}\n"
+    "ログストリーム: {stream_name}\n"
+    "検出したログ本文:\n{log_lines}\n"
+    "検出したログ前のログ:\n{prev_logs}"
+)
+
+# AWS Chatbot custom notification schema, spelled out as json.dumps would write it
+# so only the title and description need encoding per message
+_CHATBOT_PAYLOAD = '{"version": "1.0", "source": "custom", "content": {"title": %s, "description": %s}}'
+
+# Lone surrogates (e.g. "\udc80" from undecodable log bytes) cannot be encoded as UTF-8
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+
+# Template placeholder, e.g. {project}
+_TEMPLATE_VAR_RE = re.compile(r"\{(\w+)\}")
+
+# SNS client, reused across warm Lambda invocations
+_get_sns_client = lazy_client(lambda: boto3.client("sns", config=BOTO_CONFIG))
 
 
 def resolve_sns_topic(monitor, project, global_config):
@@ -68,6 +101,59 @@ def resolve_template(monitor, project, global_config):
     )
 
 
+def _expand_template(text, variables):
+    """Replace {name} placeholders in a single pass.
+
+    Placeholders that are not in ``variables`` are left untouched, and
+    substituted values are never re-expanded.
+
+    Args:
+        text: Template string.
+        variables: Mapping of placeholder name to replacement string.
+
+    Returns:
+        str: Expanded string.
+    """
+    parts = list(_parse_template(text))
+    # Odd positions hold placeholder names, even positions the literal text around them
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = variables.get(name, "{" + name + "}")
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_template(text):
+    """Split a template into alternating literal text and placeholder names.
+
+    Cached because the same few subject templates are rendered for every
+    notification.
+
+    Args:
+        text: Template string.
+
+    Returns:
+        tuple: Literal and placeholder-name parts, as returned by re.split.
+    """
+    return tuple(_TEMPLATE_VAR_RE.split(text))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_jst(epoch_sec):
+    """Format an epoch-seconds timestamp as JST for notifications.
+
+    Cached because bursts of events, and repeated notifications within a run,
+    share the same second.
+
+    Args:
+        epoch_sec: Epoch time in whole seconds.
+
+    Returns:
+        str: Timestamp formatted like "2026-02-20 14:10:00 JST".
+    """
+    return datetime.fromtimestamp(epoch_sec, tz=JST).strftime(_JST_FORMAT)
+
+
 def render_message(template, project, monitor, matches, action, global_config, state=None, previous_log_lines=None):
     """Render notification message by expanding template variables.
 
@@ -88,41 +174,38 @@ def render_message(template, project, monitor, matches, action, global_config, s
     Returns:
         dict: Rendered message with "subject" and "body" keys.
     """
-    now_jst = datetime.now(JST)
-
     # Use the timestamp of the latest matched log event if available, otherwise fallback to current time
     if matches and "timestamp" in matches[-1]:
-        dt = datetime.fromtimestamp(matches[-1]["timestamp"] / 1000.0, tz=JST)
-        detected_at_str = dt.strftime("%Y-%m-%d %H:%M:%S JST")
+        detected_at_str = _format_jst(matches[-1]["timestamp"] // 1000)
     else:
-        detected_at_str = now_jst.strftime("%Y-%m-%d %H:%M:%S JST")
+        detected_at_str = datetime.now(JST).strftime(_JST_FORMAT)
 
     severity = (monitor.get("severity") or global_config["defaults"]["severity"]).upper()
     log_group = project.get("override_log_group") or global_config.get("source_log_group", "")
     max_lines = int(global_config.get("max_log_lines", 20))
 
-    # Extract stream names and log lines from matches
-    stream_names = sorted(set(e.get("logStreamName", "") for e in matches)) if matches else []
-    
-    # Deduplicate burst log messages
-    ordered_logs = []
-    log_counts = {}
-    for e in matches:
-        msg = e.get("message", "").rstrip()
-        if msg not in log_counts:
-            ordered_logs.append(msg)
-            log_counts[msg] = 0
-        log_counts[msg] += 1
-
-    formatted_lines = []
-    for msg in ordered_logs[:max_lines]:
-        count = log_counts[msg]
-        if count > 1:
-            formatted_lines.append(f"{msg} (x{count})")
-        else:
-            formatted_lines.append(msg)
-
-    log_lines = "\n".join(formatted_lines)
+    # RECOVER and zero-count renders have nothing to deduplicate or format
+    stream_names = []
+    log_lines = ""
+    if matches:
+        # Deduplicate burst log messages (dicts keep insertion order) and collect
+        # stream names in the same pass
+        log_counts = {}
+        streams = set()
+        for e in matches:
+            msg = e.get("message", "").rstrip()
+            log_counts[msg] = log_counts.get(msg, 0) + 1
+            streams.add(e.get("logStreamName", ""))
+
+        # Only the unique names are sorted, which is a handful even for large bursts
+        stream_names = sorted(streams)
+
+        log_lines = "\n".join(
+            [
+                f"{msg} (x{count})" if count > 1 else msg
+                for msg, count in itertools.islice(log_counts.items(), max_lines)
+            ]
+        )
 
     # Extract previous log lines
     prev_logs_text = "(なし)"
@@ -151,41 +234,41 @@ def render_message(template, project, monitor, matches, action, global_config, s
     # Subject is templated
     # Use action-specific template adjustments for RECOVER
     if action == "RECOVER":
-        subject = template.get("subject", "").replace("{severity}", "RECOVER")
+        subject = _expand_template(template.get("subject", ""), {**variables, "severity": "RECOVER"})
         body = f"{variables['project']} の {variables['keyword']} が復旧しました\n{variables['detected_at']}"
     else:
-        subject = template.get("subject", "")
-        # Expand subject
-        for key, value in variables.items():
-            subject = subject.replace(f"{{{key}}}", value)
+        subject = _expand_template(template.get("subject", ""), variables)
 
         # Hardcoded required format
-        body_parts = [subject]
-        if mention:
-            body_parts.append(mention)
-
-        body_parts.extend(
-            [
-                f"検出件数: {variables['count']}",
-                f"タイムスタンプ: {variables['detected_at']}",
-                f"ロググループ: {variables['log_group']}",
-                f"ログストリーム: {variables['stream_name']}",
-                "検出したログ本文:",
-                variables["log_lines"],
-                "検出したログ前のログ:",
-                prev_logs_text,
-            ]
+        body = _BODY_TEMPLATE.format(
+            subject=subject,
+            mention_line=f"{mention}\n" if mention else "",
+            count=variables["count"],
+            detected_at=variables["detected_at"],
+            log_group=variables["log_group"],
+            stream_name=variables["stream_name"],
+            log_lines=variables["log_lines"],
+            prev_logs=prev_logs_text,
         )
-        body = "\n".join(body_parts)
-
-    # Expand template variables for RECOVER subject
-    if action == "RECOVER":
-        for key, value in variables.items():
-            subject = subject.replace(f"{{{key}}}", value)
 
     return {"subject": subject, "body": body}
 
 
+def _payload_overflow(payload_str):
+    """Return how many UTF-8 bytes a payload exceeds the SNS limit by (<= 0 if it fits).
+
+    Args:
+        payload_str: Serialised SNS message.
+
+    Returns:
+        int: Excess size in bytes.
+    """
+    # A character is at most 4 UTF-8 bytes, so short payloads need no encoding pass
+    if len(payload_str) * 4 <= _SNS_MAX_MESSAGE_BYTES:
+        return 0
+    return len(payload_str.encode("utf-8")) - _SNS_MAX_MESSAGE_BYTES
+
+
 def sns_publish(topic_arn, message, client=None):
     """Publish a notification message to an SNS topic.
 
@@ -194,35 +277,39 @@ def sns_publish(topic_arn, message, client=None):
         message: Dict with "subject" and "body" keys.
         client: Optional boto3 SNS client (for testing).
     """
-    client = client or boto3.client("sns")
-
-    body = message["body"]
-
-    # Format for AWS Chatbot custom notification schema
-    chatbot_payload = {
-        "version": "1.0",
-        "source": "custom",
-        "content": {
-            "title": message["subject"][:100],  # Max 100 characters for title
-            "description": body,
-        },
-    }
+    client = client or _get_sns_client()
+
+    # Unescaped (ensure_ascii=False) surrogates would make the payload unencodable,
+    # so they are replaced with U+FFFD up front
+    body = _SURROGATE_RE.sub("\ufffd", message["body"])
+    subject = _SURROGATE_RE.sub("\ufffd", message["subject"][:100])  # SNS subject / Chatbot title limit
 
-    payload_str = json.dumps(chatbot_payload)
+    # Keep non-ASCII as UTF-8 rather than \uXXXX escapes: Japanese text costs 3 bytes
+    # per character instead of 6, and the SNS limit is measured on the UTF-8 size.
+    title_json = json.dumps(subject, ensure_ascii=False)
+    payload_str = _CHATBOT_PAYLOAD % (title_json, json.dumps(body, ensure_ascii=False))
+    overflow = _payload_overflow(payload_str)
 
     # Truncate if payload exceeds SNS 256KB limit
-    if len(payload_str.encode("utf-8")) > _SNS_MAX_MESSAGE_BYTES:
-        max_body_bytes = _SNS_MAX_MESSAGE_BYTES - 1024  # Reserve space for JSON envelope
-        truncated_body = body.encode("utf-8")[:max_body_bytes].decode("utf-8", errors="ignore")
-        truncated_body += "\n... (truncated)"
-        chatbot_payload["content"]["description"] = truncated_body
-        payload_str = json.dumps(chatbot_payload)
+    if overflow > 0:
+        body_bytes = body.encode("utf-8")
+        view = memoryview(body_bytes)
+        budget = len(body_bytes)
+        # JSON escaping (newlines, quotes) can make the encoded body larger than the raw
+        # one, so shrink until the serialised payload actually fits; usually one pass.
+        while overflow > 0 and budget > 0:
+            budget = max(budget - overflow - len(_TRUNCATION_MARKER), 0)
+            # Decoding straight from the view avoids copying the slice; "ignore" drops
+            # a multi-byte character split at the cut.
+            description = str(view[:budget], "utf-8", "ignore") + _TRUNCATION_MARKER
+            payload_str = _CHATBOT_PAYLOAD % (title_json, json.dumps(description, ensure_ascii=False))
+            overflow = _payload_overflow(payload_str)
         logger.warning("SNS message truncated for topic %s (exceeded 256KB)", topic_arn)
 
     try:
         client.publish(
             TopicArn=topic_arn,
-            Subject=message["subject"][:100],  # SNS subject limit
+            Subject=subject,
             Message=payload_str,
         )
         logger.info("Published notification to %s: %s", topic_arn, message["subject"])
@@ -5,12 +5,28 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Sentinel distinguishing "key absent" from "key explicitly set to None/null"
+_UNSET = object()
+
+
+def index_states(states):
+    """Index STATE records by sort key for O(1) lookup.
+
+    Args:
+        states: List of all STATE records from DynamoDB.
+
+    Returns:
+        dict: Mapping of sk (e.g. "project-a#ERROR") to STATE record.
+    """
+    return {state["sk"]: state for state in states if "sk" in state}
+
 
 def find_state(states, project_sk, keyword):
     """Find the STATE record for a specific project+keyword combination.
 
     Args:
-        states: List of all STATE records from DynamoDB.
+        states: List of all STATE records from DynamoDB, or a dict built by
+            ``index_states`` (preferred when looking up many monitors).
         project_sk: Project sort key (e.g. "project-a").
         keyword: Monitor keyword (e.g. "ERROR").
 
@@ -18,27 +34,31 @@ def find_state(states, project_sk, keyword):
         dict or None: Matching STATE record, or None if not found.
     """
     target_sk = f"{project_sk}#{keyword}"
+    if isinstance(states, dict):
+        return states.get(target_sk)
+
     for state in states:
         if state.get("sk") == target_sk:
             return state
     return None
 
 
-def _minutes_since(iso_timestamp):
+def _minutes_since(iso_timestamp, now=None):
     """Calculate minutes elapsed since the given ISO timestamp.
 
     Args:
-        iso_timestamp: ISO 8601 timestamp string.
+        iso_timestamp: ISO 8601 timestamp string (a trailing "Z" is accepted).
+        now: Optional aware datetime to measure against; defaults to the current UTC time.
 
     Returns:
         float: Minutes elapsed since the timestamp.
     """
-    dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
-    now = datetime.now(timezone.utc)
+    dt = datetime.fromisoformat(iso_timestamp)
+    now = now or datetime.now(timezone.utc)
     return (now - dt).total_seconds() / 60
 
 
-def evaluate_state(state, matches, monitor, global_config):
+def evaluate_state(state, matches, monitor, global_config, now=None):
     """Determine the action to take based on current state and detection results.
 
     State transitions (DESIGN.md §6.3):
@@ -52,6 +72,8 @@ def evaluate_state(state, matches, monitor, global_config):
         matches: List of matching log events (after exclusion filtering).
         monitor: Monitor configuration dict.
         global_config: GLOBAL configuration dict.
+        now: Optional aware datetime used for the renotify interval, so one run
+            evaluates every monitor against the same clock.
 
     Returns:
         str: Action to take - one of:
@@ -59,25 +81,23 @@ def evaluate_state(state, matches, monitor, global_config):
     """
     count = len(matches)
     status = state.get("status", "OK") if state else "OK"
-    defaults = global_config.get("defaults", {})
-    notify_on_recover = defaults.get("notify_on_recover", False)
-
-    # Resolve renotify_min: MONITOR → GLOBAL defaults
-    # Use a sentinel to distinguish "key absent" from "key explicitly set to None/null"
-    _UNSET = object()
-    renotify = monitor.get("renotify_min", _UNSET)
-    if renotify is _UNSET:
-        renotify = defaults.get("renotify_min")
 
+    # GLOBAL defaults are only consulted on the ALARM branches that need them
     if count > 0:
         if status == "OK":
             return "NOTIFY"
         elif status == "ALARM":
-            last_notified = state.get("last_notified_at") if state else None
-            if last_notified and renotify and _minutes_since(last_notified) >= renotify:
-                return "RENOTIFY"
+            last_notified = state.get("last_notified_at")
+            if last_notified:
+                # Resolve renotify_min: MONITOR → GLOBAL defaults
+                renotify = monitor.get("renotify_min", _UNSET)
+                if renotify is _UNSET:
+                    renotify = global_config.get("defaults", {}).get("renotify_min")
+                if renotify and _minutes_since(last_notified, now) >= renotify:
+                    return "RENOTIFY"
             return "SUPPRESS"
     else:
         if status == "ALARM":
+            notify_on_recover = global_config.get("defaults", {}).get("notify_on_recover", False)
             return "RECOVER" if notify_on_recover else "RECOVER_SILENT"
         return "NOOP"
@@ -7,7 +7,7 @@ import pytest
 from moto import mock_aws
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def aws_env():
     """Set dummy AWS credentials for moto."""
     os.environ["AWS_ACCESS_KEY_ID"] = "testing"
@@ -26,11 +26,31 @@ def aws_env():
         os.environ.pop(key, None)
 
 
-@pytest.fixture
-def dynamodb_table():
-    """Create a mocked DynamoDB log-monitor table."""
+@pytest.fixture(autouse=True)
+def reset_aws_clients(monkeypatch):
+    """Drop module-level cached AWS clients and config so each test builds its own."""
+    from log_monitor import config, handler, log_searcher, metrics, notifier
+
+    getters = (
+        config._get_table,
+        log_searcher._get_logs_client,
+        metrics._get_cloudwatch_client,
+        notifier._get_sns_client,
+    )
+    for getter in getters:
+        getter.reset()
+    monkeypatch.setattr(handler, "_global_config_cache", {"config": None, "expires_at": 0.0})
+    yield
+    for getter in getters:
+        getter.reset()
+
+
+@pytest.fixture(scope="session")
+def _mocked_table():
+    """Create the mocked log-monitor table once for the whole test session."""
     with mock_aws():
         dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+        # moto creates tables synchronously ACTIVE, so no table_exists waiter is needed
         table = dynamodb.create_table(
             TableName="log-monitor",
             KeySchema=[
@@ -43,10 +63,24 @@ def dynamodb_table():
             ],
             BillingMode="PAY_PER_REQUEST",
         )
-        table.meta.client.get_waiter("table_exists").wait(TableName="log-monitor")
         yield table
 
 
+@pytest.fixture
+def dynamodb_table(_mocked_table):
+    """Mocked DynamoDB log-monitor table, emptied again after each test."""
+    yield _mocked_table
+    scan_kwargs = {"ProjectionExpression": "pk, sk"}
+    with _mocked_table.batch_writer() as batch:
+        while True:
+            response = _mocked_table.scan(**scan_kwargs)
+            for item in response["Items"]:
+                batch.delete_item(Key={"pk": item["pk"], "sk": item["sk"]})
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
 @pytest.fixture
 def global_config_item():
     """Sample GLOBAL#CONFIG record."""
@@ -0,0 +1,34 @@
+"""Tests for aws.py — lazily created shared clients."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from log_monitor.aws import lazy_client
+
+
+class TestLazyClient:
+    def test_factory_runs_once_under_concurrent_first_use(self):
+        calls = []
+        barrier = threading.Barrier(8, timeout=5)
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        get = lazy_client(factory)
+
+        def first_use(_):
+            barrier.wait()
+            return get()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(first_use, range(8)))
+
+        assert len(calls) == 1
+        assert all(c is clients[0] for c in clients)
+
+    def test_reset_builds_a_new_instance(self):
+        get = lazy_client(object)
+        first = get()
+        get.reset()
+        assert get() is not first
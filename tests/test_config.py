@@ -1,14 +1,18 @@
 """Tests for config.py — DynamoDB configuration management."""
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from log_monitor.config import (
+    batch_put_states,
+    build_state_item,
+    build_state_suppress_item,
     get_global_config,
+    iter_all_states,
     query_all_projects,
     query_all_states,
     update_project_timestamp,
-    update_state,
-    update_state_suppress,
 )
 
 
@@ -34,6 +38,13 @@ class TestQueryAllProjects:
         sks = {p["sk"] for p in result}
         assert sks == {"project-a", "project-b"}
 
+    def test_projects_only_used_attributes(self, dynamodb_table, project_a_item):
+        dynamodb_table.put_item(Item={**project_a_item, "notes": "owned by team A", "enabled": True})
+        (result,) = query_all_projects(dynamodb_table)
+        assert "notes" not in result
+        assert "pk" not in result
+        assert {k: v for k, v in project_a_item.items() if k != "pk"} == result
+
     def test_returns_empty_list_when_no_projects(self, dynamodb_table):
         result = query_all_projects(dynamodb_table)
         assert result == []
@@ -51,6 +62,21 @@ class TestQueryAllStates:
         assert result == []
 
 
+class TestIterAllStates:
+    def test_yields_across_pages(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [{"sk": "project-a#ERROR"}], "LastEvaluatedKey": {"pk": "STATE", "sk": "project-a#ERROR"}},
+            {"Items": [{"sk": "project-b#ERROR"}]},
+        ]
+
+        states = iter_all_states(table)
+        assert next(states) == {"sk": "project-a#ERROR"}
+        assert table.query.call_count == 1
+        assert list(states) == [{"sk": "project-b#ERROR"}]
+        assert table.query.call_args[1]["ExclusiveStartKey"] == {"pk": "STATE", "sk": "project-a#ERROR"}
+
+
 class TestUpdateProjectTimestamp:
     def test_updates_last_searched_at(self, dynamodb_table, project_a_item):
         dynamodb_table.put_item(Item=project_a_item)
@@ -59,33 +85,60 @@ class TestUpdateProjectTimestamp:
         assert result["last_searched_at"] == "2026-02-20T06:00:00Z"
 
 
-class TestUpdateState:
-    def test_creates_alarm_state(self, dynamodb_table):
-        update_state(dynamodb_table, "project-a", "ERROR", "ALARM", "2026-02-20T05:10:00Z", 3, 1)
-        result = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
-        assert result["status"] == "ALARM"
-        assert result["last_detected_at"] == "2026-02-20T05:10:00Z"
-        assert result["last_notified_at"] == "2026-02-20T05:10:00Z"
-        assert result["current_streak"] == 1
-
-    def test_updates_to_ok_state(self, dynamodb_table):
-        # First create ALARM state
-        update_state(dynamodb_table, "project-a", "ERROR", "ALARM", "2026-02-20T05:10:00Z", 3, 1)
-        # Then recover
-        update_state(dynamodb_table, "project-a", "ERROR", "OK", "2026-02-20T06:00:00Z")
-        result = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
-        assert result["status"] == "OK"
-        assert result["current_streak"] == 0
-
-
-class TestUpdateStateSuppress:
-    def test_updates_count_and_streak_without_notified_at(self, dynamodb_table):
-        # Create initial state
-        update_state(dynamodb_table, "project-a", "ERROR", "ALARM", "2026-02-20T05:10:00Z", 3, 1)
-        original = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
-
-        # Suppress — should not update last_notified_at
-        update_state_suppress(dynamodb_table, "project-a", "ERROR", 2, 2)
-        result = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
-        assert result["current_streak"] == 2
-        assert result["last_notified_at"] == original["last_notified_at"]
+class TestBuildStateItem:
+    def test_new_alarm_state(self):
+        item = build_state_item(None, "project-a", "ERROR", "ALARM", "2026-02-20T05:10:00Z", 3, 1)
+        assert item == {
+            "pk": "STATE",
+            "sk": "project-a#ERROR",
+            "status": "ALARM",
+            "last_detected_at": "2026-02-20T05:10:00Z",
+            "last_notified_at": "2026-02-20T05:10:00Z",
+            "detection_count": 3,
+            "current_streak": 1,
+        }
+
+    def test_alarm_accumulates_detection_count(self):
+        state = {"pk": "STATE", "sk": "project-a#ERROR", "status": "ALARM", "detection_count": 5}
+        item = build_state_item(state, "project-a", "ERROR", "ALARM", "2026-02-20T05:10:00Z", 2, 3)
+        assert item["detection_count"] == 7
+        assert item["current_streak"] == 3
+        assert state["detection_count"] == 5
+
+    def test_ok_keeps_history(self):
+        state = {
+            "pk": "STATE",
+            "sk": "project-a#ERROR",
+            "status": "ALARM",
+            "last_notified_at": "2026-02-20T05:10:00Z",
+            "detection_count": 5,
+            "current_streak": 2,
+        }
+        item = build_state_item(state, "project-a", "ERROR", "OK", "2026-02-20T06:00:00Z")
+        assert item["status"] == "OK"
+        assert item["current_streak"] == 0
+        assert item["detection_count"] == 5
+        assert item["last_notified_at"] == "2026-02-20T05:10:00Z"
+
+    def test_suppress_keeps_notified_at(self):
+        state = {
+            "pk": "STATE",
+            "sk": "project-a#ERROR",
+            "status": "ALARM",
+            "last_notified_at": "2026-02-20T05:10:00Z",
+            "detection_count": 3,
+        }
+        item = build_state_suppress_item(state, "project-a", "ERROR", 2, 2)
+        assert item["status"] == "ALARM"
+        assert item["detection_count"] == 5
+        assert item["current_streak"] == 2
+        assert item["last_notified_at"] == "2026-02-20T05:10:00Z"
+
+
+class TestBatchPutStates:
+    def test_writes_all_items(self, dynamodb_table):
+        now = "2026-02-20T05:10:00Z"
+        items = [build_state_item(None, "project-a", f"KW{i}", "ALARM", now, 1, 1) for i in range(30)]
+        batch_put_states(dynamodb_table, items)
+        result = query_all_states(dynamodb_table)
+        assert len(result) == 30
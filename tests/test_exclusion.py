@@ -1,6 +1,17 @@
 """Tests for exclusion.py — Exclusion pattern filtering."""
 
-from log_monitor.exclusion import apply_exclusions_regex
+from log_monitor.exclusion import _compile_exclusions, apply_exclusions_regex, is_literal_pattern
+
+
+class TestIsLiteralPattern:
+    def test_plain_text_is_literal(self):
+        assert is_literal_pattern("ERROR: connection reset")
+        assert is_literal_pattern("ping OK")
+
+    def test_metacharacters_are_not_literal(self):
+        assert not is_literal_pattern(r"healthcheck\s+handler")
+        assert not is_literal_pattern("cache (miss|hit)")
+        assert not is_literal_pattern("[invalid")
 
 
 class TestApplyExclusionsRegex:
@@ -75,3 +86,36 @@ class TestApplyExclusionsRegex:
         events = self._make_events(["ERROR: cache miss", "ERROR: cache miss again"])
         result = apply_exclusions_regex(events, ["cache miss"])
         assert len(result) == 0
+
+    def test_patterns_with_groups_combined(self):
+        events = self._make_events(["ERROR: cache miss", "ERROR: ping OK", "ERROR: disk full"])
+        result = apply_exclusions_regex(events, [r"cache (miss|hit)", r"ping (OK|NG)"])
+        assert [e["message"] for e in result] == ["ERROR: disk full"]
+
+    def test_numeric_backreference_kept_separate(self):
+        events = self._make_events(["ERROR: retry retry", "ERROR: retry once", "ERROR: healthcheck"])
+        result = apply_exclusions_regex(events, [r"(health)check", r"(\w+) \1"])
+        assert [e["message"] for e in result] == ["ERROR: retry once"]
+
+    def test_conditional_group_reference_kept_separate(self):
+        events = self._make_events(["xb", "xd"])
+        result = apply_exclusions_regex(events, [r"(z)", r"(x)?(?(1)b|c)"])
+        assert [e["message"] for e in result] == ["xd"]
+
+    def test_inline_global_flag_falls_back_to_separate(self):
+        events = self._make_events(["ERROR: HealthCheck", "ERROR: cache miss", "ERROR: disk full"])
+        result = apply_exclusions_regex(events, [r"(?i)healthcheck", "cache miss"])
+        assert [e["message"] for e in result] == ["ERROR: disk full"]
+
+    def test_literal_and_regex_patterns_mixed(self):
+        events = self._make_events(["ERROR: ping OK", "ERROR: cache hit", "ERROR: disk full"])
+        result = apply_exclusions_regex(events, ["ping OK", r"cache (miss|hit)"])
+        assert [e["message"] for e in result] == ["ERROR: disk full"]
+
+    def test_compiled_patterns_cached(self):
+        events = self._make_events(["ERROR: cache hit", "ERROR: disk full"])
+        apply_exclusions_regex(events, [r"cache (miss|hit)", r"disk\s+full"])
+        hits = _compile_exclusions.cache_info().hits
+        result = apply_exclusions_regex(events, [r"cache (miss|hit)", r"disk\s+full"])
+        assert _compile_exclusions.cache_info().hits == hits + 1
+        assert result == []
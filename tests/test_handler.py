@@ -1,12 +1,13 @@
 """Integration tests for handler.py — Full Lambda flow."""
 
+import threading
+from datetime import datetime, timezone
 from unittest.mock import patch
 
-import boto3
 import pytest
-from moto import mock_aws
 
-from log_monitor.handler import handler
+from log_monitor.config import batch_put_states, get_global_config, update_project_timestamp
+from log_monitor.handler import _flatten_monitors, _to_iso, handler
 
 
 @pytest.fixture
@@ -17,56 +18,38 @@ def full_setup(dynamodb_table, global_config_item, project_a_item):
     return dynamodb_table
 
 
+class TestToIso:
+    def test_drops_microseconds_and_uses_z_suffix(self):
+        dt = datetime(2026, 2, 20, 5, 10, 0, 123456, tzinfo=timezone.utc)
+        assert _to_iso(dt) == "2026-02-20T05:10:00Z"
+
+
+class TestFlattenMonitors:
+    def test_expands_keyword_lists(self):
+        template = {"subject": "[OOM]"}
+        monitors = _flatten_monitors(
+            [
+                {"keyword": "ERROR", "severity": "critical"},
+                {"keyword": ["OOM", "FATAL"], "notification_template": template},
+                {"severity": "info"},
+            ]
+        )
+        assert [m["keyword"] for m in monitors] == ["ERROR", "OOM", "FATAL"]
+        assert monitors[1]["notification_template"] is template
+        assert monitors[2]["notification_template"] is template
+
+
 class TestHandler:
-    @mock_aws
-    @patch("log_monitor.handler.boto3")
     @patch("log_monitor.handler.get_previous_log_lines")
     @patch("log_monitor.handler.filter_log_events_with_pagination")
     @patch("log_monitor.handler.sns_publish")
-    @patch("log_monitor.handler.put_metric_data")
-    def test_full_flow_with_detections(self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, mock_boto3):
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_full_flow_with_detections(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, dynamodb_table, global_config_item
+    ):
         """Test complete flow: detect errors → notify → update state."""
-        # Set up DynamoDB
-        dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
-        table = dynamodb.create_table(
-            TableName="log-monitor",
-            KeySchema=[
-                {"AttributeName": "pk", "KeyType": "HASH"},
-                {"AttributeName": "sk", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "pk", "AttributeType": "S"},
-                {"AttributeName": "sk", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.meta.client.get_waiter("table_exists").wait(TableName="log-monitor")
-
-        # Insert config
-        table.put_item(
-            Item={
-                "pk": "GLOBAL",
-                "sk": "CONFIG",
-                "source_log_group": "/aws/app/shared-logs",
-                "metric_namespace": "LogMonitor",
-                "max_log_lines": 20,
-                "defaults": {
-                    "severity": "warning",
-                    "renotify_min": 60,
-                    "notify_on_recover": True,
-                },
-                "sns_topics": {
-                    "critical": "arn:aws:sns:ap-northeast-1:123456789012:critical-alerts",
-                    "warning": "arn:aws:sns:ap-northeast-1:123456789012:warning-alerts",
-                    "info": "arn:aws:sns:ap-northeast-1:123456789012:info-alerts",
-                },
-                "notification_template": {
-                    "subject": "[{severity}] {project} - {keyword}",
-                },
-            }
-        )
-
-        table.put_item(
+        dynamodb_table.put_item(Item=global_config_item)
+        dynamodb_table.put_item(
             Item={
                 "pk": "PROJECT",
                 "sk": "project-a",
@@ -79,9 +62,6 @@ class TestHandler:
             }
         )
 
-        # Mock boto3.resource to return our mocked DynamoDB
-        mock_boto3.resource.return_value = dynamodb
-
         # Mock log search to return some matches
         mock_filter.return_value = [
             {"message": "ERROR: database failed", "logStreamName": "project-a/s1", "timestamp": 1000},
@@ -90,8 +70,8 @@ class TestHandler:
 
         mock_get_prev_logs.return_value = ["INFO: connecting", "INFO: connected"]
 
-        # Run handler
-        result = handler({}, None)
+        with patch("log_monitor.handler._get_table", return_value=dynamodb_table):
+            result = handler({}, None)
 
         # Verify
         assert result["processed_projects"] == 1
@@ -107,193 +87,294 @@ class TestHandler:
         # Verify get_prev_logs was called
         assert mock_get_prev_logs.call_count == 2
         mock_get_prev_logs.assert_any_call(
-            log_group="/aws/app/shared-logs", stream_name="project-a/s1", timestamp=1000, limit=5, match_message="ERROR: database failed"
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=1000,
+            limit=5,
+            match_message="ERROR: database failed",
         )
 
-        # Metrics should have been sent
-        assert mock_put_metric.call_count == 2
+        # Metrics should have been sent in a single batch
+        mock_put_metric.assert_called_once_with("LogMonitor", [("project-a", "ERROR", 2), ("project-a", "FATAL", 2)])
 
         # Check STATE was created in DynamoDB
-        state_error = table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"}).get("Item")
+        state_error = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"}).get("Item")
         assert state_error is not None
         assert state_error["status"] == "ALARM"
-        state_fatal = table.get_item(Key={"pk": "STATE", "sk": "project-a#FATAL"}).get("Item")
+        state_fatal = dynamodb_table.get_item(Key={"pk": "STATE", "sk": "project-a#FATAL"}).get("Item")
         assert state_fatal is not None
         assert state_fatal["status"] == "ALARM"
 
-    @mock_aws
-    @patch("log_monitor.handler.boto3")
     @patch("log_monitor.handler.get_previous_log_lines")
     @patch("log_monitor.handler.filter_log_events_with_pagination")
     @patch("log_monitor.handler.sns_publish")
-    @patch("log_monitor.handler.put_metric_data")
-    def test_metrics_disabled(self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, mock_boto3):
-        """Test put_metric_data is conditionally disabled."""
-        dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
-        table = dynamodb.create_table(
-            TableName="log-monitor",
-            KeySchema=[
-                {"AttributeName": "pk", "KeyType": "HASH"},
-                {"AttributeName": "sk", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "pk", "AttributeType": "S"},
-                {"AttributeName": "sk", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.meta.client.get_waiter("table_exists").wait(TableName="log-monitor")
-
-        table.put_item(
-            Item={
-                "pk": "GLOBAL",
-                "sk": "CONFIG",
-                "source_log_group": "/aws/app/shared-logs",
-                "metric_namespace": "LogMonitor",
-                "disable_custom_metrics": True,  # Key metric disable flag
-                "defaults": {"severity": "warning", "renotify_min": 60, "notify_on_recover": True},
-                "sns_topics": {
-                    "critical": "arn:aws:sns:dummy:critical",
-                    "warning": "arn:aws:sns:dummy:warning",
-                    "info": "arn:aws:sns:dummy:info",
-                },
-                "notification_template": {"subject": "sub", "body": "body"},
-            }
-        )
-
-        table.put_item(
-            Item={
-                "pk": "PROJECT",
-                "sk": "project-a",
-                "enabled": True,
-                "monitors": [{"keyword": "ERROR", "severity": "critical"}],
-            }
-        )
-
-        mock_boto3.resource.return_value = dynamodb
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_metrics_disabled(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup, global_config_item
+    ):
+        """Test put_metric_data_batch is conditionally disabled."""
+        full_setup.put_item(Item={**global_config_item, "disable_custom_metrics": True})
         mock_filter.return_value = [{"message": "ERROR: fail"}]
 
-        handler({}, None)
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            handler({}, None)
 
         mock_put_metric.assert_not_called()
 
-    @mock_aws
-    @patch("log_monitor.handler.boto3")
     @patch("log_monitor.handler.get_previous_log_lines")
     @patch("log_monitor.handler.filter_log_events_with_pagination")
     @patch("log_monitor.handler.sns_publish")
-    @patch("log_monitor.handler.put_metric_data")
-    def test_disabled_project_skipped(self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, mock_boto3):
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_disabled_project_skipped(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup, project_a_item
+    ):
         """Disabled projects should be completely skipped."""
-        dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
-        table = dynamodb.create_table(
-            TableName="log-monitor",
-            KeySchema=[
-                {"AttributeName": "pk", "KeyType": "HASH"},
-                {"AttributeName": "sk", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "pk", "AttributeType": "S"},
-                {"AttributeName": "sk", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.meta.client.get_waiter("table_exists").wait(TableName="log-monitor")
+        full_setup.put_item(Item={**project_a_item, "enabled": False})
 
-        table.put_item(
-            Item={
-                "pk": "GLOBAL",
-                "sk": "CONFIG",
-                "source_log_group": "/aws/app/shared-logs",
-                "metric_namespace": "LogMonitor",
-                "max_log_lines": 20,
-                "defaults": {"severity": "warning", "renotify_min": 60, "notify_on_recover": True},
-                "sns_topics": {
-                    "critical": "arn:aws:sns:...:critical",
-                    "warning": "arn:aws:sns:...:warning",
-                    "info": "arn:aws:sns:...:info",
-                },
-                "notification_template": {"subject": "sub", "body": "body"},
-            }
-        )
-
-        table.put_item(
-            Item={
-                "pk": "PROJECT",
-                "sk": "project-disabled",
-                "display_name": "Disabled Project",
-                "stream_prefix": "disabled",
-                "enabled": False,
-                "monitors": [{"keyword": "ERROR", "severity": "critical"}],
-            }
-        )
-
-        mock_boto3.resource.return_value = dynamodb
-
-        result = handler({}, None)
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            result = handler({}, None)
 
         assert result["processed_projects"] == 0
         mock_filter.assert_not_called()
         mock_sns.assert_not_called()
 
-    @mock_aws
-    @patch("log_monitor.handler.boto3")
     @patch("log_monitor.handler.get_previous_log_lines")
     @patch("log_monitor.handler.filter_log_events_with_pagination")
     @patch("log_monitor.handler.sns_publish")
-    @patch("log_monitor.handler.put_metric_data")
-    def test_no_detections_noop(self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, mock_boto3):
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_no_detections_noop(self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup):
         """No detections and status=OK → NOOP, no notifications."""
-        dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
-        table = dynamodb.create_table(
-            TableName="log-monitor",
-            KeySchema=[
-                {"AttributeName": "pk", "KeyType": "HASH"},
-                {"AttributeName": "sk", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "pk", "AttributeType": "S"},
-                {"AttributeName": "sk", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.meta.client.get_waiter("table_exists").wait(TableName="log-monitor")
+        mock_filter.return_value = []
 
-        table.put_item(
-            Item={
-                "pk": "GLOBAL",
-                "sk": "CONFIG",
-                "source_log_group": "/aws/app/shared-logs",
-                "metric_namespace": "LogMonitor",
-                "max_log_lines": 20,
-                "defaults": {"severity": "warning", "renotify_min": 60, "notify_on_recover": True},
-                "sns_topics": {
-                    "critical": "arn:aws:sns:...:critical",
-                    "warning": "arn:aws:sns:...:warning",
-                    "info": "arn:aws:sns:...:info",
-                },
-                "notification_template": {"subject": "sub", "body": "body"},
-            }
-        )
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            result = handler({}, None)
+
+        assert result["total_detections"] == 0
+        assert result["notifications_sent"] == 0
+        mock_sns.assert_not_called()
+        # Metrics should still be sent (with value=0)
+        mock_put_metric.assert_called_once_with("LogMonitor", [("project-a", "ERROR", 0), ("project-a", "TIMEOUT", 0)])
+
+    @patch("log_monitor.handler.get_previous_log_lines")
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_failed_search_skips_only_that_project(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup, project_b_item
+    ):
+        """A search error in one project must not affect searches running concurrently for others."""
+        full_setup.put_item(Item=project_b_item)
+
+        def fake_filter(log_group, stream_prefix, keyword, start_time, end_time, negative_terms):
+            if stream_prefix == "project-a":
+                raise RuntimeError("FilterLogEvents failed")
+            return []
 
-        table.put_item(
+        mock_filter.side_effect = fake_filter
+
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            result = handler({}, None)
+
+        assert result["processed_projects"] == 1
+        assert mock_filter.call_count == 4
+        project_a = full_setup.get_item(Key={"pk": "PROJECT", "sk": "project-a"})["Item"]
+        project_b = full_setup.get_item(Key={"pk": "PROJECT", "sk": "project-b"})["Item"]
+        assert "last_searched_at" not in project_a
+        assert "last_searched_at" in project_b
+
+        # Literal exclusions from project-a are pushed into the CloudWatch filter
+        project_a_calls = [c for c in mock_filter.call_args_list if c.kwargs["stream_prefix"] == "project-a"]
+        error_call = next(c for c in project_a_calls if c.kwargs["keyword"] == "ERROR")
+        assert error_call.kwargs["negative_terms"] == [
+            "healthcheck",
+            "ping OK",
+            "ERROR: connection reset",
+            "ERROR: cache miss",
+        ]
+
+    @patch("log_monitor.handler.get_previous_log_lines")
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_searches_run_in_parallel(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup, project_b_item
+    ):
+        """All monitor searches are in flight at once instead of one after another."""
+        full_setup.put_item(Item=project_b_item)
+        # Every search waits for the other three; run serially, the first would time out
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fake_filter(**kwargs):
+            barrier.wait()
+            return []
+
+        mock_filter.side_effect = fake_filter
+
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            result = handler({}, None)
+
+        assert mock_filter.call_count == 4
+        assert result["processed_projects"] == 2
+
+    @patch("log_monitor.handler.get_previous_log_lines", return_value=[])
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_failed_publish_withholds_only_its_state(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup
+    ):
+        """Publishes run concurrently; a failed one leaves its STATE unwritten so it is retried."""
+        mock_filter.side_effect = lambda **kwargs: [
+            {"message": f"{kwargs['keyword']}: boom", "timestamp": 1000, "logStreamName": "project-a/s1"}
+        ]
+
+        def fake_publish(topic_arn, message):
+            if "TIMEOUT" in message["subject"]:
+                raise RuntimeError("SNS error")
+
+        mock_sns.side_effect = fake_publish
+
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            result = handler({}, None)
+
+        assert mock_sns.call_count == 2
+        assert result["notifications_sent"] == 1
+        assert result["processed_projects"] == 0
+        error_state = full_setup.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
+        assert error_state["status"] == "ALARM"
+        assert "Item" not in full_setup.get_item(Key={"pk": "STATE", "sk": "project-a#TIMEOUT"})
+        project_a = full_setup.get_item(Key={"pk": "PROJECT", "sk": "project-a"})["Item"]
+        assert "last_searched_at" not in project_a
+
+    @patch("log_monitor.handler.get_previous_log_lines", return_value=[])
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_failed_publish_does_not_double_count_suppressed_monitor(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup
+    ):
+        """A SUPPRESS update next to a failed publish is applied once when the window is re-run."""
+        update_project_timestamp(full_setup, "project-a", "2026-02-20T05:00:00Z")
+        full_setup.put_item(
             Item={
-                "pk": "PROJECT",
-                "sk": "project-a",
-                "display_name": "Project Alpha",
-                "stream_prefix": "project-a",
-                "enabled": True,
-                "monitors": [{"keyword": "ERROR", "severity": "critical"}],
+                "pk": "STATE",
+                "sk": "project-a#ERROR",
+                "status": "ALARM",
+                "last_notified_at": _to_iso(datetime.now(timezone.utc)),
+                "detection_count": 5,
+                "current_streak": 1,
             }
         )
+        mock_filter.side_effect = lambda **kwargs: [
+            {"message": f"{kwargs['keyword']}: boom", "timestamp": 1000, "logStreamName": "project-a/s1"}
+        ]
+        mock_sns.side_effect = [RuntimeError("SNS error"), None]
+
+        with patch("log_monitor.handler._get_table", return_value=full_setup):
+            first = handler({}, None)
+            second = handler({}, None)
+
+        assert first["processed_projects"] == 0
+        assert second["processed_projects"] == 1
+        # The first run did not advance the window, so the second searched it again
+        assert [c.kwargs["start_time"] for c in mock_filter.call_args_list] == [1771563600000] * 4
+        error_state = full_setup.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})["Item"]
+        assert error_state["detection_count"] == 6
+        assert error_state["current_streak"] == 2
 
-        mock_boto3.resource.return_value = dynamodb
+    @patch("log_monitor.handler.get_previous_log_lines", return_value=[])
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_failed_state_flush_skips_only_that_project(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, full_setup, project_b_item
+    ):
+        """A STATE write failure keeps that project's window; other projects are still persisted."""
+        full_setup.put_item(Item=project_b_item)
+        mock_filter.side_effect = lambda **kwargs: [
+            {"message": f"{kwargs['keyword']}: boom", "timestamp": 1000, "logStreamName": "s1"}
+        ]
+
+        def fake_batch_put(table, items):
+            if any(item["sk"].startswith("project-a#") for item in items):
+                raise RuntimeError("ProvisionedThroughputExceeded")
+            batch_put_states(table, items)
+
+        with (
+            patch("log_monitor.handler._get_table", return_value=full_setup),
+            patch("log_monitor.handler.batch_put_states", side_effect=fake_batch_put),
+        ):
+            result = handler({}, None)
+
+        assert result["notifications_sent"] == 4
+        project_a = full_setup.get_item(Key={"pk": "PROJECT", "sk": "project-a"})["Item"]
+        project_b = full_setup.get_item(Key={"pk": "PROJECT", "sk": "project-b"})["Item"]
+        assert "last_searched_at" not in project_a
+        assert "last_searched_at" in project_b
+        assert full_setup.get_item(Key={"pk": "STATE", "sk": "project-b#ERROR"})["Item"]["status"] == "ALARM"
+        assert "Item" not in full_setup.get_item(Key={"pk": "STATE", "sk": "project-a#ERROR"})
+
+    def test_missing_global_config_raises(self, dynamodb_table, project_a_item):
+        """Errors from the concurrent configuration reads propagate to the caller."""
+        dynamodb_table.put_item(Item=project_a_item)
+
+        with patch("log_monitor.handler._get_table", return_value=dynamodb_table):
+            with pytest.raises(KeyError, match="GLOBAL#CONFIG"):
+                handler({}, None)
+
+    @patch("log_monitor.handler.get_previous_log_lines")
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    @patch("log_monitor.handler.sns_publish")
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_identical_searches_issued_once(
+        self, mock_put_metric, mock_sns, mock_filter, mock_get_prev_logs, dynamodb_table, global_config_item
+    ):
+        """Projects that share log group, stream prefix and keyword reuse one search."""
+        dynamodb_table.put_item(Item=global_config_item)
+        for sk in ("project-x", "project-y"):
+            dynamodb_table.put_item(
+                Item={
+                    "pk": "PROJECT",
+                    "sk": sk,
+                    "stream_prefix": "shared",
+                    "last_searched_at": "2026-02-20T05:00:00Z",
+                    "monitors": [{"keyword": "ERROR"}],
+                }
+            )
         mock_filter.return_value = []
 
-        result = handler({}, None)
+        with patch("log_monitor.handler._get_table", return_value=dynamodb_table):
+            result = handler({}, None)
 
-        assert result["total_detections"] == 0
-        assert result["notifications_sent"] == 0
-        mock_sns.assert_not_called()
-        # Metrics should still be sent (with value=0)
-        mock_put_metric.assert_called_once()
+        assert result["processed_projects"] == 2
+        assert result["total_monitors"] == 2
+        mock_filter.assert_called_once()
+
+    @patch("log_monitor.handler.filter_log_events_with_pagination", return_value=[])
+    @patch("log_monitor.handler.put_metric_data_batch")
+    def test_global_config_cached_across_warm_invocations(self, mock_put_metric, mock_filter, full_setup):
+        """GLOBAL#CONFIG is read once while the cache TTL has not expired."""
+        with (
+            patch("log_monitor.handler._get_table", return_value=full_setup),
+            patch("log_monitor.handler.get_global_config", wraps=get_global_config) as mock_get_global,
+        ):
+            handler({}, None)
+            handler({}, None)
+
+        mock_get_global.assert_called_once_with(full_setup)
+
+    @patch("log_monitor.handler.iter_all_states")
+    @patch("log_monitor.handler.filter_log_events_with_pagination")
+    def test_no_enabled_projects_skips_state_query(
+        self, mock_filter, mock_iter_states, dynamodb_table, global_config_item
+    ):
+        """With nothing to monitor, STATE records are never loaded."""
+        dynamodb_table.put_item(Item=global_config_item)
+        dynamodb_table.put_item(Item={"pk": "PROJECT", "sk": "project-off", "enabled": False, "monitors": []})
+
+        with patch("log_monitor.handler._get_table", return_value=dynamodb_table):
+            result = handler({}, None)
+
+        assert result["processed_projects"] == 0
+        mock_iter_states.assert_not_called()
+        mock_filter.assert_not_called()
@@ -1,25 +1,81 @@
 """Tests for log_searcher.py — CloudWatch Logs search."""
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
 from unittest.mock import MagicMock
 
-from log_monitor.log_searcher import filter_log_events_with_pagination, get_previous_log_lines, iso_to_epoch_ms
+import pytest
+
+from log_monitor.log_searcher import (
+    _get_logs_client,
+    build_filter_pattern,
+    filter_log_events_with_pagination,
+    get_previous_log_lines,
+    iso_to_epoch_ms,
+)
+
+
+class TestGetLogsClient:
+    def test_client_reused_across_calls(self):
+        client = _get_logs_client()
+        assert _get_logs_client() is client
+        assert client.meta.config.tcp_keepalive is True
+
+    def test_concurrent_first_use_builds_one_client(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: _get_logs_client(), range(8)))
+        assert all(c is clients[0] for c in clients)
 
 
 class TestIsoToEpochMs:
     def test_utc_timestamp(self):
         result = iso_to_epoch_ms("2026-02-20T05:10:00Z")
-        from datetime import datetime, timezone
-
         expected = int(datetime(2026, 2, 20, 5, 10, tzinfo=timezone.utc).timestamp() * 1000)
         assert result == expected
 
     def test_timezone_offset(self):
         result = iso_to_epoch_ms("2026-02-20T14:10:00+09:00")
-        from datetime import datetime, timezone
-
         expected = int(datetime(2026, 2, 20, 5, 10, tzinfo=timezone.utc).timestamp() * 1000)
         assert result == expected
 
+    def test_keeps_milliseconds(self):
+        assert iso_to_epoch_ms("2026-02-20T05:10:00.999Z") == 1771564200999
+        assert iso_to_epoch_ms("1970-01-01T00:00:00.001+00:00") == 1
+
+    def test_repeated_conversion_is_cached(self):
+        iso_to_epoch_ms("2026-02-20T05:20:00Z")
+        hits = iso_to_epoch_ms.cache_info().hits
+        iso_to_epoch_ms("2026-02-20T05:20:00Z")
+        assert iso_to_epoch_ms.cache_info().hits == hits + 1
+
+
+class TestBuildFilterPattern:
+    def test_keyword_only(self):
+        assert build_filter_pattern("ERROR") == '"ERROR"'
+
+    def test_negative_terms(self):
+        result = build_filter_pattern("ERROR", ["connection reset", "cache miss"])
+        assert result == '"ERROR" -"connection reset" -"cache miss"'
+
+    def test_skips_terms_with_quotes(self):
+        assert build_filter_pattern("ERROR", ['say "hi"', ""]) == '"ERROR"'
+
+    def test_respects_length_limit(self):
+        result = build_filter_pattern("ERROR", ["x" * 600, "y" * 600])
+        assert result == '"ERROR" -"' + "x" * 600 + '"'
+
+    def test_escapes_quotes_and_backslashes_in_keyword(self):
+        assert build_filter_pattern('say "hi" C:\\tmp') == '"say \\"hi\\" C:\\\\tmp"'
+
+    def test_json_filter_passed_through_without_negative_terms(self):
+        pattern = '{ $.level = "ERROR" }'
+        assert build_filter_pattern(pattern, ["healthcheck"]) == pattern
+
+    def test_json_filter_with_leading_whitespace_is_not_given_negative_terms(self):
+        pattern = ' { $.level = "ERROR" } '
+        assert build_filter_pattern(pattern, ["healthcheck"]) == '{ $.level = "ERROR" }'
+
 
 class TestFilterLogEventsWithPagination:
     def test_single_page(self):
@@ -46,6 +102,80 @@ class TestFilterLogEventsWithPagination:
         assert call_kwargs["logGroupName"] == "/aws/app/shared-logs"
         assert call_kwargs["logStreamNamePrefix"] == "project-a"
         assert call_kwargs["filterPattern"] == '"ERROR"'
+        assert call_kwargs["limit"] == 10000
+
+    def test_accepts_epoch_milliseconds(self):
+        mock_client = MagicMock()
+        mock_client.filter_log_events.return_value = {"events": []}
+
+        filter_log_events_with_pagination(
+            log_group="/aws/app/shared-logs",
+            stream_prefix="project-a",
+            keyword="ERROR",
+            start_time=1771564200000,
+            end_time="2026-02-20T05:20:00Z",
+            client=mock_client,
+        )
+
+        call_kwargs = mock_client.filter_log_events.call_args[1]
+        assert call_kwargs["startTime"] == 1771564200000
+        assert call_kwargs["endTime"] == 1771564800000
+
+    def test_accepts_decimal_epoch_milliseconds(self):
+        mock_client = MagicMock()
+        mock_client.filter_log_events.return_value = {"events": []}
+
+        filter_log_events_with_pagination(
+            log_group="/aws/app/shared-logs",
+            stream_prefix="project-a",
+            keyword="ERROR",
+            start_time=Decimal("1771564200000"),
+            end_time=1771564800000,
+            client=mock_client,
+        )
+
+        call_kwargs = mock_client.filter_log_events.call_args[1]
+        assert call_kwargs["startTime"] == 1771564200000
+        assert type(call_kwargs["startTime"]) is int
+
+    def test_rejects_bool_bound(self):
+        with pytest.raises(TypeError):
+            filter_log_events_with_pagination(
+                log_group="/aws/app/shared-logs",
+                stream_prefix="project-a",
+                keyword="ERROR",
+                start_time=True,
+                end_time=1771564800000,
+                client=MagicMock(),
+            )
+
+    def test_rejects_fractional_decimal_bound(self):
+        with pytest.raises(ValueError, match="integral"):
+            filter_log_events_with_pagination(
+                log_group="/aws/app/shared-logs",
+                stream_prefix="project-a",
+                keyword="ERROR",
+                start_time=Decimal("1771564200000.5"),
+                end_time=1771564800000,
+                client=MagicMock(),
+            )
+
+    def test_negative_terms_in_filter_pattern(self):
+        mock_client = MagicMock()
+        mock_client.filter_log_events.return_value = {"events": []}
+
+        filter_log_events_with_pagination(
+            log_group="/aws/app/shared-logs",
+            stream_prefix="project-a",
+            keyword="ERROR",
+            start_time="2026-02-20T05:00:00Z",
+            end_time="2026-02-20T05:10:00Z",
+            negative_terms=["healthcheck"],
+            client=mock_client,
+        )
+
+        call_kwargs = mock_client.filter_log_events.call_args[1]
+        assert call_kwargs["filterPattern"] == '"ERROR" -"healthcheck"'
 
     def test_pagination(self):
         mock_client = MagicMock()
@@ -103,24 +233,127 @@ class TestFilterLogEventsWithPagination:
         assert result == []
 
 
+class FakeLogStream:
+    """Minimal backward GetLogEvents emulation over a fixed list of events.
+
+    Honours startTime/endTime, limit and nextToken; like the real API, it
+    returns the token it was given once the window is exhausted.
+    ``max_per_response`` emulates the 1 MB response cap, which returns fewer
+    events than ``limit`` even though older ones exist.
+    """
+
+    def __init__(self, events, max_per_response=None):
+        self.events = events
+        self.max_per_response = max_per_response
+        self.calls = []
+
+    def get_log_events(self, **kwargs):
+        self.calls.append(kwargs)
+        assert kwargs["startFromHead"] is False
+        in_range = [e for e in self.events if kwargs["startTime"] <= e["timestamp"] < kwargs["endTime"]]
+        token = kwargs.get("nextToken")
+        end = int(token.split("/")[1]) if token else len(in_range)
+        if end == 0:
+            return {"events": [], "nextBackwardToken": token or "b/0"}
+        size = min(kwargs["limit"], self.max_per_response or kwargs["limit"])
+        begin = max(0, end - size)
+        return {"events": in_range[begin:end], "nextBackwardToken": f"b/{begin}"}
+
+
 class TestGetPreviousLogLines:
+    def test_fast_path_single_backward_read(self):
+        """Enough lines before the target in the tail → one backward call, no older pages."""
+        mock_client = MagicMock()
+        mock_client.get_log_events.return_value = {
+            "events": [{"message": f"INFO: line {i}\n", "timestamp": 1000 + i} for i in range(8)]
+            + [{"message": "ERROR: db failed\n", "timestamp": 3000}],
+        }
+
+        result = get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=3000,
+            limit=3,
+            match_message="ERROR: db failed\n",
+            client=mock_client,
+        )
+
+        assert result == ["INFO: line 5", "INFO: line 6", "INFO: line 7"]
+        mock_client.get_log_events.assert_called_once()
+        call_kwargs = mock_client.get_log_events.call_args[1]
+        assert call_kwargs["startFromHead"] is False
+        assert call_kwargs["limit"] == 13
+        assert call_kwargs["startTime"] == 0
+        assert call_kwargs["endTime"] == 3001
+
+    def test_short_tail_stops_on_repeated_token(self):
+        """Fewer events than requested → one empty older read confirms the window is exhausted."""
+        stream = FakeLogStream(
+            [
+                {"message": "INFO: only line\n", "timestamp": 2000},
+                {"message": "ERROR: db failed\n", "timestamp": 3000},
+            ]
+        )
+
+        result = get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=3000,
+            limit=5,
+            match_message="ERROR: db failed\n",
+            client=stream,
+        )
+
+        assert result == ["INFO: only line"]
+        assert len(stream.calls) == 2
+
+    def test_size_capped_short_page_reads_older_events(self):
+        """A page cut short by the 1 MB response cap is not mistaken for the start of the window."""
+        lines = [{"message": f"INFO: trace {i}\n", "timestamp": 1000 + i} for i in range(6)]
+        stream = FakeLogStream(lines + [{"message": "ERROR: db failed\n", "timestamp": 3000}], max_per_response=3)
+
+        result = get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=3000,
+            limit=5,
+            match_message="ERROR: db failed\n",
+            client=stream,
+        )
+
+        assert result == [f"INFO: trace {i}" for i in range(1, 6)]
+        assert len(stream.calls) == 2
+
+    def test_burst_pushing_target_out_of_tail_reads_older_pages(self):
+        """Target pushed out of the tail by a same-timestamp burst → older pages are read backward."""
+        burst = [{"message": f"ERROR: burst {i}\n", "timestamp": 3000} for i in range(20)]
+        before = [{"message": "INFO: before\n", "timestamp": 2000}]
+        target = {"message": "ERROR: first\n", "timestamp": 3000}
+        stream = FakeLogStream(before + [target] + burst)
+
+        result = get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=3000,
+            limit=5,
+            match_message="ERROR: first\n",
+            client=stream,
+        )
+
+        assert result == ["INFO: before"]
+        assert len(stream.calls) == 3
+        assert stream.calls[1]["nextToken"] == "b/7"
+        assert stream.calls[1]["limit"] == 10000
+
     def test_returns_lines_before_target(self):
         """Basic: lines before the exact target timestamp are returned."""
-        mock_client = MagicMock()
-        mock_client.get_log_events.side_effect = [
-            {
-                "events": [
-                    {"message": "INFO: starting up\n", "timestamp": 1000},
-                    {"message": "INFO: connected\n", "timestamp": 2000},
-                    {"message": "ERROR: db failed\n", "timestamp": 3000},
-                ],
-                "nextForwardToken": "token-1",
-            },
-            {
-                "events": [],
-                "nextForwardToken": "token-1",
-            },
-        ]
+        stream = FakeLogStream(
+            [
+                {"message": "INFO: starting up\n", "timestamp": 1000},
+                {"message": "INFO: connected\n", "timestamp": 2000},
+                {"message": "ERROR: db failed\n", "timestamp": 3000},
+            ]
+        )
 
         result = get_previous_log_lines(
             log_group="/aws/app/shared-logs",
@@ -128,58 +361,73 @@ class TestGetPreviousLogLines:
             timestamp=3000,
             limit=5,
             match_message="ERROR: db failed\n",
-            client=mock_client,
+            client=stream,
         )
 
         assert result == ["INFO: starting up", "INFO: connected"]
 
+    def test_only_window_before_target_is_requested(self):
+        stream = FakeLogStream([{"message": "ERROR\n", "timestamp": 200000}])
+
+        get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=200000,
+            limit=5,
+            client=stream,
+            window_ms=30000,
+        )
+
+        assert stream.calls[0]["startTime"] == 170000
+        assert stream.calls[0]["endTime"] == 200001
+
+    def test_large_limit_capped_at_api_maximum(self):
+        events = [{"message": f"INFO: line {i}\n", "timestamp": 1000 + i} for i in range(5)]
+        stream = FakeLogStream(events + [{"message": "ERROR\n", "timestamp": 2000}])
+
+        result = get_previous_log_lines(
+            log_group="/aws/app/shared-logs",
+            stream_name="project-a/s1",
+            timestamp=2000,
+            limit=20000,
+            client=stream,
+        )
+
+        assert stream.calls[0]["limit"] == 10000
+        assert result == [f"INFO: line {i}" for i in range(5)]
+
     def test_same_timestamp_burst_with_match_message(self):
         """Multiple events at the same timestamp — only cut at matching message."""
-        mock_client = MagicMock()
-        mock_client.get_log_events.side_effect = [
-            {
-                "events": [
-                    {"message": "INFO: step 1\n", "timestamp": 1000},
-                    {"message": "INFO: step 2\n", "timestamp": 2000},
-                    {"message": "ERROR: first\n", "timestamp": 3000},
-                    {"message": "ERROR: second\n", "timestamp": 3000},
-                ],
-                "nextForwardToken": "token-1",
-            },
-            {
-                "events": [],
-                "nextForwardToken": "token-1",
-            },
-        ]
+        stream = FakeLogStream(
+            [
+                {"message": "INFO: step 1\n", "timestamp": 1000},
+                {"message": "INFO: step 2\n", "timestamp": 2000},
+                {"message": "ERROR: first\n", "timestamp": 3000},
+                {"message": "ERROR: second\n", "timestamp": 3000},
+                {"message": "ERROR: third\n", "timestamp": 3000},
+            ]
+        )
 
-        # Should find "ERROR: second" (last match scanning backward) and return everything before it
+        # Should find "ERROR: second" and return everything before it, not the later burst line
         result = get_previous_log_lines(
             log_group="/aws/app/shared-logs",
             stream_name="project-a/s1",
             timestamp=3000,
             limit=5,
             match_message="ERROR: second\n",
-            client=mock_client,
+            client=stream,
         )
 
         assert result == ["INFO: step 1", "INFO: step 2", "ERROR: first"]
 
     def test_fallback_when_target_not_found(self):
         """If exact match is not found, fall back to timestamp-based filter."""
-        mock_client = MagicMock()
-        mock_client.get_log_events.side_effect = [
-            {
-                "events": [
-                    {"message": "INFO: before\n", "timestamp": 1000},
-                    {"message": "ERROR: different msg\n", "timestamp": 3000},
-                ],
-                "nextForwardToken": "token-1",
-            },
-            {
-                "events": [],
-                "nextForwardToken": "token-1",
-            },
-        ]
+        stream = FakeLogStream(
+            [
+                {"message": "INFO: before\n", "timestamp": 1000},
+                {"message": "ERROR: different msg\n", "timestamp": 3000},
+            ]
+        )
 
         result = get_previous_log_lines(
             log_group="/aws/app/shared-logs",
@@ -187,7 +435,7 @@ class TestGetPreviousLogLines:
             timestamp=3000,
             limit=5,
             match_message="ERROR: nonexistent\n",
-            client=mock_client,
+            client=stream,
         )
 
         # Fallback: only events strictly before timestamp=3000
@@ -195,29 +443,21 @@ class TestGetPreviousLogLines:
 
     def test_respects_limit(self):
         """Only the last `limit` lines are returned."""
-        mock_client = MagicMock()
-        mock_client.get_log_events.side_effect = [
-            {
-                "events": [
-                    {"message": "line 1\n", "timestamp": 1000},
-                    {"message": "line 2\n", "timestamp": 2000},
-                    {"message": "line 3\n", "timestamp": 3000},
-                    {"message": "ERROR\n", "timestamp": 4000},
-                ],
-                "nextForwardToken": "token-1",
-            },
-            {
-                "events": [],
-                "nextForwardToken": "token-1",
-            },
-        ]
+        stream = FakeLogStream(
+            [
+                {"message": "line 1\n", "timestamp": 1000},
+                {"message": "line 2\n", "timestamp": 2000},
+                {"message": "line 3\n", "timestamp": 3000},
+                {"message": "ERROR\n", "timestamp": 4000},
+            ]
+        )
 
         result = get_previous_log_lines(
             log_group="/aws/app/shared-logs",
             stream_name="project-a/s1",
             timestamp=4000,
             limit=2,
-            client=mock_client,
+            client=stream,
         )
 
         assert result == ["line 2", "line 3"]
@@ -256,21 +496,27 @@ class TestGetPreviousLogLines:
         assert result == []
 
     def test_pagination(self):
-        """Results spanning multiple pages are collected correctly."""
+        """Results spanning multiple backward pages are collected correctly, stopping at the token repeat."""
         mock_client = MagicMock()
         mock_client.get_log_events.side_effect = [
             {
+                # A full first page (limit 3 + buffer 10) in which the target has too few predecessors
                 "events": [
-                    {"message": "INFO: page 1\n", "timestamp": 1000},
-                ],
-                "nextForwardToken": "token-2",
+                    {"message": "INFO: page 2\n", "timestamp": 2000},
+                    {"message": "ERROR: target\n", "timestamp": 3000},
+                ]
+                + [{"message": "TRACE: same ms\n", "timestamp": 3000}] * 11,
+                "nextBackwardToken": "b-1",
             },
             {
                 "events": [
-                    {"message": "INFO: page 2\n", "timestamp": 2000},
-                    {"message": "ERROR: target\n", "timestamp": 3000},
+                    {"message": "INFO: page 1\n", "timestamp": 1000},
                 ],
-                "nextForwardToken": "token-2",  # Same token = no more data
+                "nextBackwardToken": "b-2",
+            },
+            {
+                "events": [],
+                "nextBackwardToken": "b-2",  # Same token = no more data
             },
         ]
 
@@ -278,10 +524,11 @@ class TestGetPreviousLogLines:
             log_group="/aws/app/shared-logs",
             stream_name="project-a/s1",
             timestamp=3000,
-            limit=5,
+            limit=3,
             match_message="ERROR: target\n",
             client=mock_client,
         )
 
         assert result == ["INFO: page 1", "INFO: page 2"]
-        assert mock_client.get_log_events.call_count == 2
+        assert mock_client.get_log_events.call_count == 3
+        assert mock_client.get_log_events.call_args_list[2][1]["nextToken"] == "b-2"
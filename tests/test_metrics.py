@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from log_monitor.metrics import put_metric_data
+from log_monitor.metrics import put_metric_data, put_metric_data_batch
 
 
 class TestPutMetricData:
@@ -27,9 +27,10 @@ class TestPutMetricData:
         assert metric["Value"] == 5
         assert metric["Unit"] == "Count"
 
-        dims = {d["Name"]: d["Value"] for d in metric["Dimensions"]}
-        assert dims["Project"] == "project-a"
-        assert dims["Keyword"] == "ERROR"
+        assert metric["Dimensions"] == [
+            {"Name": "Project", "Value": "project-a"},
+            {"Name": "Keyword", "Value": "ERROR"},
+        ]
 
     def test_sends_zero_count(self):
         mock_client = MagicMock()
@@ -56,3 +57,46 @@ class TestPutMetricData:
                 value=1,
                 client=mock_client,
             )
+
+
+class TestPutMetricDataBatch:
+    def test_sends_all_metrics_in_one_call(self):
+        mock_client = MagicMock()
+        put_metric_data_batch(
+            namespace="LogMonitor",
+            detections=[("project-a", "ERROR", 5), ("project-b", "WARN", 0)],
+            client=mock_client,
+        )
+
+        mock_client.put_metric_data.assert_called_once()
+        call_args = mock_client.put_metric_data.call_args[1]
+        assert call_args["Namespace"] == "LogMonitor"
+        assert [m["Value"] for m in call_args["MetricData"]] == [5, 0]
+        assert call_args["MetricData"][1]["Dimensions"] == [
+            {"Name": "Project", "Value": "project-b"},
+            {"Name": "Keyword", "Value": "WARN"},
+        ]
+
+    def test_chunks_to_api_limit(self):
+        mock_client = MagicMock()
+        detections = [("project-a", f"KW{i}", i) for i in range(2500)]
+        put_metric_data_batch(namespace="LogMonitor", detections=detections, client=mock_client)
+
+        sizes = [len(c[1]["MetricData"]) for c in mock_client.put_metric_data.call_args_list]
+        assert sizes == [1000, 1000, 500]
+
+    def test_failed_chunk_does_not_stop_later_chunks(self):
+        mock_client = MagicMock()
+        mock_client.put_metric_data.side_effect = [Exception("Throttling"), None]
+        detections = [("project-a", f"KW{i}", i) for i in range(1500)]
+
+        with pytest.raises(Exception, match="Throttling"):
+            put_metric_data_batch(namespace="LogMonitor", detections=detections, client=mock_client)
+
+        sizes = [len(c[1]["MetricData"]) for c in mock_client.put_metric_data.call_args_list]
+        assert sizes == [1000, 500]
+
+    def test_empty_detections_skips_call(self):
+        mock_client = MagicMock()
+        put_metric_data_batch(namespace="LogMonitor", detections=[], client=mock_client)
+        mock_client.put_metric_data.assert_not_called()
@@ -1,7 +1,10 @@
 """Tests for notifier.py — SNS notification with fallback resolution."""
 
+import json
 from unittest.mock import MagicMock
 
+import pytest
+
 from log_monitor.notifier import render_message, resolve_sns_topic, resolve_template, sns_publish
 
 
@@ -121,6 +124,54 @@ class TestRenderMessage:
         assert "検出したログ本文:\nERROR: db failed (x2)\nERROR: timeout" in result["body"]
         assert "検出したログ前のログ:\nINFO: user login\nINFO: process started" in result["body"]
 
+    def test_render_notify_body_layout_without_mention(self):
+        template = {"subject": "{keyword}"}
+        project = {"sk": "project-a"}
+        monitor = {"keyword": "ERROR"}
+        matches = [{"message": "ERROR {literal} braces\n", "logStreamName": "s1", "timestamp": 1771564200000}]
+        global_config = {"source_log_group": "/lg", "defaults": {"severity": "warning"}}
+
+        result = render_message(template, project, monitor, matches, "NOTIFY", global_config)
+        assert result["body"] == (
+            "ERROR\n"
+            "検出件数: 1\n"
+            "タイムスタンプ: 2026-02-20 14:10:00 JST\n"
+            "ロググループ: /lg\n"
+            "ログストリーム: s1\n"
+            "検出したログ本文:\nERROR {literal} braces\n"
+            "検出したログ前のログ:\n(なし)"
+        )
+
+    def test_render_respects_max_log_lines_after_dedup(self):
+        template = {"subject": "{keyword}"}
+        project = {"sk": "project-a"}
+        monitor = {"keyword": "ERROR"}
+        matches = [{"message": f"ERROR: {i % 3}\n", "logStreamName": "s1", "timestamp": i} for i in range(9)]
+        global_config = {"max_log_lines": 2, "defaults": {"severity": "warning"}}
+
+        result = render_message(template, project, monitor, matches, "NOTIFY", global_config)
+        assert "検出したログ本文:\nERROR: 0 (x3)\nERROR: 1 (x3)\n検出したログ前のログ:" in result["body"]
+
+    def test_subject_expanded_in_single_pass(self):
+        template = {"subject": "[{severity}] {project} {unknown}"}
+        project = {"sk": "project-a", "display_name": "Team {keyword}"}
+        monitor = {"keyword": "ERROR", "severity": "info"}
+        global_config = {"defaults": {"severity": "warning"}}
+
+        result = render_message(template, project, monitor, [], "NOTIFY", global_config)
+        assert result["subject"] == "[INFO] Team {keyword} {unknown}"
+
+    def test_detected_at_uses_latest_match_in_jst(self):
+        template = {"subject": "{detected_at}"}
+        project = {"sk": "project-a"}
+        monitor = {"keyword": "ERROR"}
+        # 2026-02-20T05:10:00.999Z
+        matches = [{"message": "ERROR\n", "logStreamName": "s1", "timestamp": 1771564200999}]
+        global_config = {"defaults": {"severity": "warning"}}
+
+        result = render_message(template, project, monitor, matches, "NOTIFY", global_config)
+        assert result["subject"] == "2026-02-20 14:10:00 JST"
+
     def test_render_recover(self):
         template = {
             "subject": "[{severity}] {project} - {keyword}",
@@ -161,8 +212,6 @@ class TestSNSPublish:
         message = {"subject": "Test Subject", "body": "Test Body"}
         sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
 
-        import json
-
         expected_payload = {
             "version": "1.0",
             "source": "custom",
@@ -184,8 +233,6 @@ class TestSNSPublish:
         call_args = mock_client.publish.call_args[1]
         assert len(call_args["Subject"]) == 100
 
-        import json
-
         payload = json.loads(call_args["Message"])
         assert len(payload["content"]["title"]) == 100
 
@@ -194,7 +241,43 @@ class TestSNSPublish:
         mock_client.publish.side_effect = Exception("SNS error")
         message = {"subject": "Sub", "body": "Body"}
 
-        import pytest
-
         with pytest.raises(Exception, match="SNS error"):
             sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
+
+    def test_publish_truncates_oversized_body(self):
+        mock_client = MagicMock()
+        message = {"subject": "Sub", "body": "x" * (300 * 1024)}
+        sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
+
+        sent = mock_client.publish.call_args[1]["Message"]
+        assert len(sent.encode("utf-8")) <= 256 * 1024
+        assert json.loads(sent)["content"]["description"].endswith("... (truncated)")
+
+    def test_publish_truncation_accounts_for_escaping_and_multibyte(self):
+        mock_client = MagicMock()
+        message = {"subject": "件名", "body": "エラー\n" * 40000}
+        sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
+
+        sent = mock_client.publish.call_args[1]["Message"]
+        assert len(sent.encode("utf-8")) <= 256 * 1024
+        description = json.loads(sent)["content"]["description"]
+        assert description.startswith("エラー\n")
+        assert description.endswith("... (truncated)")
+
+    def test_publish_keeps_non_ascii_unescaped(self):
+        mock_client = MagicMock()
+        message = {"subject": "件名", "body": "検出"}
+        sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
+
+        assert "検出" in mock_client.publish.call_args[1]["Message"]
+
+    def test_publish_replaces_lone_surrogates(self):
+        mock_client = MagicMock()
+        message = {"subject": "ERROR \udc80", "body": "ERROR: bad byte \udc80\n" * 20000}
+        sns_publish("arn:aws:sns:...:test-topic", message, client=mock_client)
+
+        call_args = mock_client.publish.call_args[1]
+        sent = call_args["Message"]
+        assert len(sent.encode("utf-8")) <= 256 * 1024
+        assert call_args["Subject"] == "ERROR \ufffd"
+        assert json.loads(sent)["content"]["description"].startswith("ERROR: bad byte \ufffd\n")
@@ -1,8 +1,8 @@
 """Tests for state.py — State transition logic."""
 
-from unittest.mock import patch
+from datetime import datetime, timezone
 
-from log_monitor.state import evaluate_state, find_state
+from log_monitor.state import evaluate_state, find_state, index_states
 
 
 class TestFindState:
@@ -23,6 +23,16 @@ class TestFindState:
         result = find_state([], "project-a", "ERROR")
         assert result is None
 
+    def test_finds_state_in_index(self):
+        states = index_states(
+            [
+                {"sk": "project-a#ERROR", "status": "ALARM"},
+                {"sk": "project-a#TIMEOUT", "status": "OK"},
+            ]
+        )
+        assert find_state(states, "project-a", "TIMEOUT")["status"] == "OK"
+        assert find_state(states, "project-b", "ERROR") is None
+
 
 class TestEvaluateState:
     """Test all 6 state transitions from DESIGN.md §6.3."""
@@ -61,10 +71,8 @@ class TestEvaluateState:
         )
         assert result == "NOTIFY"
 
-    @patch("log_monitor.state._minutes_since")
-    def test_renotify_after_interval(self, mock_minutes):
+    def test_renotify_after_interval(self):
         """Detected + status=ALARM + renotify_min elapsed → RENOTIFY"""
-        mock_minutes.return_value = 61  # More than 60 min
         state = {
             "sk": "project-a#ERROR",
             "status": "ALARM",
@@ -75,13 +83,12 @@ class TestEvaluateState:
             matches=self._make_matches(2),
             monitor=self.MONITOR,
             global_config=self.GLOBAL_CONFIG,
+            now=datetime(2026, 2, 20, 5, 1, tzinfo=timezone.utc),  # 61 min later
         )
         assert result == "RENOTIFY"
 
-    @patch("log_monitor.state._minutes_since")
-    def test_suppress_within_interval(self, mock_minutes):
+    def test_suppress_within_interval(self):
         """Detected + status=ALARM + renotify_min NOT elapsed → SUPPRESS"""
-        mock_minutes.return_value = 30  # Less than 60 min
         state = {
             "sk": "project-a#ERROR",
             "status": "ALARM",
@@ -92,9 +99,24 @@ class TestEvaluateState:
             matches=self._make_matches(1),
             monitor=self.MONITOR,
             global_config=self.GLOBAL_CONFIG,
+            now=datetime(2026, 2, 20, 5, 10, tzinfo=timezone.utc),  # 30 min later
         )
         assert result == "SUPPRESS"
 
+    def test_renotify_measured_against_given_now(self):
+        """The caller's clock is used for the renotify interval; "Z" timestamps parse directly."""
+        state = {
+            "sk": "project-a#ERROR",
+            "status": "ALARM",
+            "last_notified_at": "2026-02-20T04:00:00Z",
+        }
+        kwargs = {"state": state, "matches": self._make_matches(1), "monitor": self.MONITOR}
+
+        before = datetime(2026, 2, 20, 4, 59, tzinfo=timezone.utc)
+        after = datetime(2026, 2, 20, 5, 0, tzinfo=timezone.utc)
+        assert evaluate_state(**kwargs, global_config=self.GLOBAL_CONFIG, now=before) == "SUPPRESS"
+        assert evaluate_state(**kwargs, global_config=self.GLOBAL_CONFIG, now=after) == "RENOTIFY"
+
     def test_suppress_renotify_null(self):
         """Detected + status=ALARM + renotify_min=null → SUPPRESS (no re-notify)"""
         state = {
@@ -169,11 +191,11 @@ class TestEvaluateState:
             "status": "ALARM",
             "last_notified_at": "2026-02-20T04:00:00Z",
         }
-        with patch("log_monitor.state._minutes_since", return_value=61):
-            result = evaluate_state(
-                state=state,
-                matches=self._make_matches(1),
-                monitor=monitor_no_renotify,
-                global_config=self.GLOBAL_CONFIG,
-            )
+        result = evaluate_state(
+            state=state,
+            matches=self._make_matches(1),
+            monitor=monitor_no_renotify,
+            global_config=self.GLOBAL_CONFIG,
+            now=datetime(2026, 2, 20, 5, 1, tzinfo=timezone.utc),
+        )
         assert result == "RENOTIFY"